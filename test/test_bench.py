@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import io
+import json
+import multiprocessing
+import os
+import unittest
+
+from yt_dlp.utils import ExtractorError
+from yt_dlp_taobao import bench
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench')
+
+
+class TestBenchCorpus(unittest.TestCase):
+    """Replay every recorded case and check what each extractor makes of it"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(FIXTURES, 'cases.json'), encoding='utf-8') as f:
+            cls.cases = json.load(f)
+        port_queue = multiprocessing.Queue()
+        cls.server = multiprocessing.Process(target=bench._serve, args=(FIXTURES, port_queue), daemon=True)
+        cls.server.start()
+        cls.ydl = bench._FixtureYoutubeDL(FIXTURES, server=f'http://127.0.0.1:{port_queue.get()}')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ydl.close()
+        cls.server.terminate()
+
+    def test_cases(self):
+        self.assertEqual(
+            {case['ie'] for case in self.cases},
+            {'Tmall', 'Taobao', 'TaobaoWorld', 'Ali1688', 'AmazonStore', 'Ebay', 'Facebook'})
+        for case in self.cases:
+            with self.subTest(case['name']):
+                info = self.ydl.extract_info(case['url'], download=False, process=False, ie_key=case['ie'])
+                expect = case['expect']
+                for field in ('id', 'title', 'url'):
+                    if field in expect:
+                        self.assertEqual(info.get(field), expect[field])
+                for field in ('thumbnails', 'formats'):
+                    if field in expect:
+                        self.assertEqual(len(info.get(field) or []), expect[field])
+
+    def test_no_live_requests(self):
+        with self.assertRaisesRegex(ExtractorError, 'No recorded response'):
+            self.ydl.urlopen('https://detail.tmall.com/item.htm?id=1')
+
+
+class TestBenchRun(unittest.TestCase):
+    """The benchmark itself
+
+    test_runs only checks that every case runs and is reported: timings
+    recorded on one machine say nothing about another. The regression gate
+    is test_no_regression, run on the machine that recorded baseline.json
+    with the tolerance in YT_DLP_TAOBAO_BENCH_TOLERANCE (e.g. 0.25), the same
+    check as "python -m yt_dlp_taobao.bench run test/bench".
+    """
+    CASES = ('tmall', 'taobao', 'taobaoworld', 'ali1688', 'amazon', 'ebay', 'facebook')
+
+    def test_runs(self):
+        out = io.StringIO()
+        bench.run(FIXTURES, repeat=1, out=out)
+        reported = [line.split()[0] for line in out.getvalue().splitlines()[1:]]
+        self.assertEqual(reported, list(self.CASES))
+
+    @unittest.skipUnless(os.getenv('YT_DLP_TAOBAO_BENCH_TOLERANCE'), 'regression gate not requested')
+    def test_no_regression(self):
+        tolerance = float(os.environ['YT_DLP_TAOBAO_BENCH_TOLERANCE'])
+        out = io.StringIO()
+        self.assertEqual(bench.run(FIXTURES, repeat=20, tolerance=tolerance, out=out), [], out.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
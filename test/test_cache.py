@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import yt_dlp
+from yt_dlp.networking import Response
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import ExtractorError
+from yt_dlp_plugins.extractor._cache import ProductCache
+from yt_dlp_plugins.extractor._common import NO_VIDEO_URL, ItemNotFoundError
+
+
+class TestProductCache(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmpdir.name, 'yt-dlp-taobao', 'products.sqlite')
+        self.cache = ProductCache(self.path, 1 << 20)
+
+    def tearDown(self):
+        self.cache._conn.close()
+        self._tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        info = {'id': '1', 'title': 'Áo khoác', 'thumbnails': [{'url': 'https://img.alicdn.com/a.jpg'}]}
+        self.assertIsNone(self.cache.get('Tmall', '1'))
+        self.cache.put('Tmall', '1', info, 60)
+        self.assertEqual(self.cache.get('Tmall', '1'), info)
+        self.assertIsNone(self.cache.get('Taobao', '1'))
+
+    def test_expiry(self):
+        self.cache.put('Tmall', '1', {'id': '1'}, 60)
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get('Tmall', '1'))
+            self.cache.put('Tmall', '2', {'id': '2'}, 60)
+        self.assertEqual(self.cache._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0], 1)
+
+    def test_eviction(self):
+        self.cache.max_bytes = 250
+        for n in range(5):
+            with mock.patch('time.time', return_value=1e9 + n):
+                self.cache.put('Tmall', str(n), {'id': str(n), 'title': 'x' * 80}, 1e9)
+        self.assertEqual(
+            [n for n in range(5) if self.cache.get('Tmall', str(n))], [3, 4])
+
+    def test_negative(self):
+        self.assertIsNone(self.cache.get_negative('Tmall', '1'))
+        self.cache.put_negative('Tmall', '1', 'not_found', 'Sản phẩm không tồn tại', 60)
+        self.assertEqual(self.cache.get_negative('Tmall', '1'), ('not_found', 'Sản phẩm không tồn tại'))
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get_negative('Tmall', '1'))
+
+    def test_invalidate(self):
+        self.cache.put('Tmall', '1', {'id': '1'}, 60)
+        self.cache.put_negative('Tmall', '2', 'no_video', {'id': '2'}, 60)
+        self.assertTrue(self.cache.invalidate('Tmall', '1'))
+        self.assertTrue(self.cache.invalidate('Tmall', '2'))
+        self.assertFalse(self.cache.invalidate('Tmall', '3'))
+        self.assertIsNone(self.cache.get('Tmall', '1'))
+        self.assertIsNone(self.cache.get_negative('Tmall', '2'))
+
+    def test_open_is_shared(self):
+        try:
+            cache = ProductCache.open(self.path, 100)
+            self.assertIs(ProductCache.open(self.path, 200), cache)
+            self.assertEqual(cache.max_bytes, 200)
+        finally:
+            ProductCache._instances.pop(self.path)._conn.close()
+
+
+class TestNegativeCache(unittest.TestCase):
+    NO_VIDEO = {'id': 'B0845NXCXF', 'url': NO_VIDEO_URL, 'thumbnails': []}
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for path in [path for path in ProductCache._instances if path.startswith(self._tmpdir.name)]:
+            ProductCache._instances.pop(path)._conn.close()
+        self._tmpdir.cleanup()
+
+    def _extractor(self, **args):
+        ydl = yt_dlp.YoutubeDL({'quiet': True, 'cachedir': self._tmpdir.name, 'extractor_args': {
+            'yt_dlp_taobao': {key: [str(value)] for key, value in args.items()}}})
+        self.addCleanup(ydl.close)
+        return ydl.get_info_extractor('AmazonStore')
+
+    def _extract(self, ie, url, result):
+        calls = []
+
+        def extract():
+            calls.append(url)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        try:
+            return ie._with_negative_cache(url, 'B0845NXCXF', extract), len(calls)
+        except ItemNotFoundError:
+            return 'not found', len(calls)
+        except ExtractorError:
+            return 'error', len(calls)
+
+    @staticmethod
+    def _http_error(url, status=404):
+        return ExtractorError('HTTP Error', cause=HTTPError(Response(io.BytesIO(b''), url, {}, status=status)))
+
+    def test_off_by_default(self):
+        ie = self._extractor()
+        for _ in range(2):
+            self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', self.NO_VIDEO)[1], 1)
+            self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', ItemNotFoundError())[1], 1)
+
+    def test_no_video(self):
+        ie = self._extractor(no_video_ttl=60)
+        self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', self.NO_VIDEO), (self.NO_VIDEO, 1))
+        self.assertEqual(self._extract(ie, 'https://amazon.com/dp/B0845NXCXF', {}), (self.NO_VIDEO, 0))
+        # Same ASIN, another marketplace
+        self.assertEqual(self._extract(ie, 'https://www.amazon.co.uk/dp/B0845NXCXF', {'id': 'uk'}), ({'id': 'uk'}, 1))
+        self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', ItemNotFoundError()), (self.NO_VIDEO, 0))
+
+    def test_not_found(self):
+        ie = self._extractor(not_found_ttl=60)
+        self.assertEqual(self._extract(ie, 'https://www.amazon.co.uk/dp/B0845NXCXF', ItemNotFoundError()), ('not found', 1))
+        self.assertEqual(self._extract(ie, 'https://www.amazon.co.uk/dp/B0845NXCXF', {}), ('not found', 0))
+        self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', {'id': 'us'}), ({'id': 'us'}, 1))
+        # Only the no_video entries are opted in
+        self.assertEqual(self._extract(ie, 'https://www.amazon.de/dp/B0845NXCXF', self.NO_VIDEO)[1], 1)
+        self.assertEqual(self._extract(ie, 'https://www.amazon.de/dp/B0845NXCXF', self.NO_VIDEO)[1], 1)
+
+    def test_http_not_found(self):
+        ie = self._extractor(not_found_ttl=60)
+        url = 'https://www.amazon.com/dp/B0845NXCXF'
+        self.assertEqual(self._extract(ie, url, self._http_error(url, 410)), ('error', 1))
+        self.assertEqual(self._extract(ie, url, {}), ('not found', 0))
+
+    def test_pushback_not_cached(self):
+        ie = self._extractor(not_found_ttl=60)
+        url = 'https://www.amazon.com/dp/B0845NXCXF'
+        for error in (self._http_error('https://www.amazon.com/errors/validateCaptcha'), self._http_error(url, 503),
+                      ExtractorError('Unable to extract data')):
+            self.assertEqual(self._extract(ie, url, error), ('error', 1))
+        self.assertEqual(self._extract(ie, url, {'id': 'us'}), ({'id': 'us'}, 1))
+
+    def test_bypass(self):
+        self.assertEqual(self._extract(
+            self._extractor(no_video_ttl=60), 'https://www.amazon.com/dp/B0845NXCXF', self.NO_VIDEO)[1], 1)
+        ie = self._extractor(no_video_ttl=60, cache_bypass='')
+        self.assertEqual(self._extract(ie, 'https://www.amazon.com/dp/B0845NXCXF', {'id': 'fresh'}), ({'id': 'fresh'}, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
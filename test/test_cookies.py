@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from yt_dlp_plugins.extractor._cookies import CookiePool
+
+COOKIES = '''# Netscape HTTP Cookie File
+.taobao.com\tTRUE\t/\tFALSE\t0\tcookie2\t{}
+'''
+
+
+class TestCookiePool(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        for name in ('a', 'b', 'c'):
+            self._write(name, name)
+        self.pool = CookiePool(self._tmpdir.name, quarantine=60)
+
+    def _write(self, name, value):
+        with open(os.path.join(self._tmpdir.name, f'{name}.txt'), 'w') as f:
+            f.write(COOKIES.format(value))
+
+    @staticmethod
+    def _value(account):
+        return next(iter(account.jar)).value
+
+    def test_rotation(self):
+        self.assertEqual(len(self.pool), 3)
+        now = time.time()
+        taken = []
+        for n in range(3):
+            with mock.patch('time.time', return_value=now + n):
+                taken.append(self.pool.acquire())
+        self.assertEqual([account.name for account in taken], ['a.txt', 'b.txt', 'c.txt'])
+        for account in taken:
+            self.pool.release(account, ok=True)
+        # Idle again: the least recently used goes first
+        with mock.patch('time.time', return_value=now + 3):
+            self.assertEqual(self.pool.acquire().name, 'a.txt')
+        self.assertIsNone(self.pool.acquire(exclude=taken))
+
+    def test_quarantine_doubles(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            account = self.pool.acquire(exclude=self.pool._accounts[1:])
+            self.pool.release(account, ok=False)
+        self.assertEqual(account.quarantined_until, now + 60)
+        self.assertEqual(account.score, 0.5)
+        with mock.patch('time.time', return_value=now + 61):
+            self.assertIs(self.pool.acquire(exclude=self.pool._accounts[1:]), account)
+            self.pool.release(account, ok=False)
+        self.assertEqual(account.quarantined_until, now + 61 + 120)
+        self.assertEqual(account.strikes, 2)
+        # A success clears the strikes
+        with mock.patch('time.time', return_value=now + 182):
+            self.assertIs(self.pool.acquire(exclude=self.pool._accounts[1:]), account)
+            self.pool.release(account, ok=True)
+        self.assertEqual((account.strikes, account.score), (0, 0.5))
+
+    def test_release_after_timeout(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            for _ in range(len(self.pool)):
+                self.pool.release(self.pool.acquire(), ok=False)
+            self.assertIsNone(self.pool.acquire())
+            self.assertEqual([s['quarantined_for'] for s in self.pool.stats()], [60, 60, 60])
+        with mock.patch('time.time', return_value=now + 59):
+            self.assertIsNone(self.pool.acquire())
+        with mock.patch('time.time', return_value=now + 60):
+            self.assertIsNotNone(self.pool.acquire())
+
+    def test_reload_changed_file(self):
+        now = time.time()
+        with mock.patch('time.time', return_value=now):
+            account = self.pool.acquire(exclude=self.pool._accounts[1:])
+            self.pool.release(account, ok=False)
+        self._write('a', 'fresh')
+        os.utime(account.path, (now + 10, now + 10))
+        with mock.patch('time.time', return_value=now + 60):
+            self.assertIs(self.pool.acquire(exclude=self.pool._accounts[1:]), account)
+        self.assertEqual(self._value(account), 'fresh')
+
+    def test_open_is_shared(self):
+        try:
+            pool = CookiePool.open(self._tmpdir.name, 30)
+            self.assertIs(CookiePool.open(self._tmpdir.name, 90), pool)
+            self.assertEqual(pool.quarantine_seconds, 90)
+        finally:
+            CookiePool._instances.pop(self._tmpdir.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
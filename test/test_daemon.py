@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import http.cookiejar
+import os
+import tempfile
+import threading
+import unittest
+
+import yt_dlp
+from yt_dlp_taobao.daemon import DaemonRunner
+
+COOKIE = '.taobao.com\tTRUE\t/\tTRUE\t0\t_m_h5_tk\t{}\n'
+
+
+class TestReloadCookies(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.path = os.path.join(self._tmpdir.name, 'cookies.txt')
+        self._write('first')
+        self.ydl = yt_dlp.YoutubeDL({'quiet': True, 'cookiefile': self.path})
+        self.addCleanup(self.ydl.close)
+        self.runner = DaemonRunner(self.ydl, workers=2)
+
+    def _write(self, value, mtime=None):
+        with open(self.path, 'w') as f:
+            f.write('# Netscape HTTP Cookie File\n' + COOKIE.format(value))
+        if mtime:
+            os.utime(self.path, (mtime, mtime))
+
+    def _header(self):
+        return self.ydl.cookiejar.get_cookie_header('https://item.taobao.com/item.htm?id=1')
+
+    def test_reload(self):
+        self.assertEqual(self._header(), '_m_h5_tk=first')
+        self.assertFalse(self.runner.reload_cookies(force=False))
+        self._write('second', mtime=os.stat(self.path).st_mtime + 10)
+        self.assertTrue(self.runner.reload_cookies(force=False))
+        self.assertEqual(self._header(), '_m_h5_tk=second')
+
+    def test_never_empty_while_reloading(self):
+        headers, done = set(), threading.Event()
+
+        def send():
+            while not done.is_set():
+                headers.add(self._header())
+
+        sender = threading.Thread(target=send)
+        sender.start()
+        try:
+            for _ in range(200):
+                self.runner.reload_cookies()
+        finally:
+            done.set()
+            sender.join()
+        self.assertEqual(headers, {'_m_h5_tk=first'})
+
+    def test_bad_file_keeps_cookies(self):
+        self.assertEqual(self._header(), '_m_h5_tk=first')
+        with open(self.path, 'w') as f:
+            f.write('{"not": "netscape"}\n')
+        with self.assertRaises(http.cookiejar.LoadError):
+            self.runner.reload_cookies()
+        self.assertEqual(self._header(), '_m_h5_tk=first')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from yt_dlp_plugins.extractor._cache import ProductCache
+from yt_dlp_taobao import bench
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench')
+
+
+class TestManifestCache(unittest.TestCase):
+    URL = 'https://www.ebay.com/itm/194509326719'
+
+    @classmethod
+    def setUpClass(cls):
+        port_queue = multiprocessing.Queue()
+        cls.server = multiprocessing.Process(target=bench._serve, args=(FIXTURES, port_queue), daemon=True)
+        cls.server.start()
+        cls.port = port_queue.get()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        for path in [path for path in ProductCache._instances if path.startswith(self._tmpdir.name)]:
+            ProductCache._instances.pop(path)._conn.close()
+        self._tmpdir.cleanup()
+
+    def _requests(self, **args):
+        """Number of requests of each of two extractions of the listing"""
+        path = os.path.join(self._tmpdir.name, 'metrics.jsonl')
+        args = {'metrics': path, **args}
+        with bench._FixtureYoutubeDL(FIXTURES, server=f'http://127.0.0.1:{self.port}', params={
+                'cachedir': self._tmpdir.name,
+                'extractor_args': {'yt_dlp_taobao': {key: [str(value)] for key, value in args.items()}}}) as ydl:
+            for _ in range(2):
+                ydl.extract_info(self.URL, download=False, process=False, ie_key='Ebay')
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line)['counters']['requests'] for line in f]
+
+    def test_off_by_default(self):
+        self.assertEqual(self._requests(), [3, 3])
+        self.assertFalse(os.path.exists(os.path.join(self._tmpdir.name, 'yt-dlp-taobao', 'products.sqlite')))
+
+    def test_manifest_ttl(self):
+        # The second extraction only fetches the listing page
+        self.assertEqual(self._requests(manifest_ttl=60), [3, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
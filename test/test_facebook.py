@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import unittest
+
+import yt_dlp
+from yt_dlp.utils import ExtractorError
+
+URL = 'https://www.facebook.com/watch/?v=10150000000000002'
+# A video page whose video data is not inline, as for logged out visitors
+PAGE = '''<html><head><title>Mèo con | Facebook</title>
+<meta property="og:image" content="https://scontent.xx.fbcdn.net/v/t15/og.jpg"></head><body>
+<script>requireLazy(["TimeSliceImpl"],function(){});</script></body></html>'''
+
+
+class TestImagesOnly(unittest.TestCase):
+    def _extract(self, images_only):
+        extractor_args = {'rate_limit': ['0']}
+        if images_only:
+            extractor_args['images_only'] = ['']
+        requested = []
+        with yt_dlp.YoutubeDL({'quiet': True, 'extractor_args': {'yt_dlp_taobao': extractor_args}}) as ydl:
+            ie = ydl.get_info_extractor('Facebook')
+
+            def download(url_or_request, video_id, *args, **kwargs):
+                url = getattr(url_or_request, 'url', url_or_request)
+                requested.append(url)
+                if url != URL:
+                    return 'for (;;);{}', None
+                return PAGE, None
+
+            ie._download_webpage_handle = download
+            try:
+                return ie.extract(URL), requested
+            except ExtractorError:
+                return None, requested
+
+    def test_no_secondary_requests(self):
+        info, requested = self._extract(images_only=True)
+        self.assertEqual(requested, [URL])
+        self.assertEqual(info['id'], '10150000000000002')
+        self.assertEqual(info['title'], 'Mèo con')
+        self.assertEqual(info['thumbnails'], [{'url': 'https://scontent.xx.fbcdn.net/v/t15/og.jpg'}])
+        self.assertNotIn('formats', info)
+
+    def test_secondary_request_without_images_only(self):
+        _, requested = self._extract(images_only=False)
+        self.assertEqual(len(requested), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
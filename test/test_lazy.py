@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import yt_dlp
+from yt_dlp_plugins.extractor import _lazy, taobao
+
+
+class TestLazyExtractor(unittest.TestCase):
+    def test_index_matches_real_classes(self):
+        for name in ('TmallIE', 'TaobaoIE', 'TaobaoWorldIE', 'Ali1688IE'):
+            with self.subTest(name):
+                lazy = getattr(taobao, name)
+                real = lazy.real_class()
+                self.assertIsNot(real, lazy)
+                self.assertEqual((real.IE_NAME, real._VALID_URL), (lazy.IE_NAME, lazy._VALID_URL))
+
+    def test_instance_is_real(self):
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            ie = taobao.TmallIE(ydl)
+        self.assertIsInstance(ie, taobao.TmallIE.real_class())
+        self.assertIs(ie._downloader, ydl)
+
+
+class TestOverrideOnImport(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        sys.path.insert(0, tmpdir.name)
+        self.addCleanup(sys.path.remove, tmpdir.name)
+        self.addCleanup(self._forget, 'lazy_target', 'lazy_override', 'lazy_broken')
+        for name, source in (
+            ('lazy_target', 'VALUE = "original"\n'),
+            ('lazy_override', 'import lazy_target\nlazy_target.VALUE = "overridden"\n'),
+            ('lazy_broken', 'raise ImportError("broken override")\n'),
+        ):
+            with open(os.path.join(tmpdir.name, f'{name}.py'), 'w') as f:
+                f.write(source)
+
+    @staticmethod
+    def _forget(*names):
+        for name in names:
+            sys.modules.pop(name, None)
+            _lazy._finder._callbacks.pop(name, None)
+
+    def test_deferred(self):
+        _lazy.override_on_import('lazy_target', 'lazy_override')
+        self.assertNotIn('lazy_override', sys.modules)
+        import lazy_target
+        self.assertEqual(lazy_target.VALUE, 'overridden')
+
+    def test_already_imported(self):
+        import lazy_target
+        _lazy.override_on_import('lazy_target', 'lazy_override')
+        self.assertEqual(lazy_target.VALUE, 'overridden')
+
+    def test_error_is_reported(self):
+        _lazy.override_on_import('lazy_target', 'lazy_broken')
+        with mock.patch.object(_lazy, 'write_string') as write_string:
+            import lazy_target
+        self.assertEqual(lazy_target.VALUE, 'original')
+        self.assertIn("'lazy_broken'", write_string.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from yt_dlp_plugins.extractor._common import ExtractionMetrics
+from yt_dlp_taobao import bench
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench')
+
+
+class TestExtractionMetrics(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        self.metrics = ExtractionMetrics('ebay:product', 'https://www.ebay.com/itm/194509326719')
+        with self.metrics.span('download'):
+            pass
+        self.metrics.count('requests', 3)
+        self.metrics.status = 'ok'
+
+    def test_jsonl(self):
+        path = os.path.join(self._tmpdir.name, 'metrics.jsonl')
+        self.metrics.export(path)
+        self.metrics.export(path)
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]['counters'], {'requests': 3})
+        self.assertEqual(list(lines[0]['spans']), ['download'])
+
+    def test_prometheus(self):
+        path = os.path.join(self._tmpdir.name, 'metrics.prom')
+        self.metrics.export(path)
+        self.metrics.export(path)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        self.assertIn('yt_dlp_taobao_extraction_success{extractor="ebay:product"} 1\n', text)
+        self.assertIn('yt_dlp_taobao_extraction_count{extractor="ebay:product",name="requests"} 3\n', text)
+        self.assertEqual(os.listdir(self._tmpdir.name), ['metrics.prom'])
+
+
+class TestExtractorCounters(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        port_queue = multiprocessing.Queue()
+        cls.server = multiprocessing.Process(target=bench._serve, args=(FIXTURES, port_queue), daemon=True)
+        cls.server.start()
+        cls.port = port_queue.get()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+
+    def _counters(self, url, ie_key):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'metrics.jsonl')
+            with bench._FixtureYoutubeDL(FIXTURES, server=f'http://127.0.0.1:{self.port}', params={
+                    'extractor_args': {'yt_dlp_taobao': {'metrics': [path]}}}) as ydl:
+                ydl.extract_info(url, download=False, process=False, ie_key=ie_key)
+            with open(path, encoding='utf-8') as f:
+                return json.loads(f.read())
+
+    def _body_size(self, *urls):
+        total = 0
+        for name in os.listdir(os.path.join(FIXTURES, 'responses')):
+            if name.endswith('.json'):
+                with open(os.path.join(FIXTURES, 'responses', name), encoding='utf-8') as f:
+                    if json.load(f)['url'] in urls:
+                        total += os.path.getsize(os.path.join(FIXTURES, 'responses', name[:-5] + '.body'))
+        return total
+
+    def test_every_request_counted(self):
+        # The listing page, then the HLS and DASH manifests
+        metrics = self._counters('https://www.ebay.com/itm/194509326719', 'Ebay')
+        self.assertEqual(metrics['status'], 'ok')
+        self.assertEqual(metrics['counters']['requests'], 3)
+        self.assertEqual(metrics['counters']['bytes'], self._body_size(
+            'https://www.ebay.com/itm/194509326719',
+            'https://video.ebaycdn.net/videos/v1/194509326719/hls.m3u8',
+            'https://video.ebaycdn.net/videos/v1/194509326719/dash.mpd'))
+        self.assertIn('download', metrics['spans'])
+        self.assertNotIn('ratelimit', metrics['spans'])
+
+    def test_streamed_read_counted(self):
+        metrics = self._counters('https://detail.tmall.com/item.htm?id=656308694954', 'Tmall')
+        self.assertEqual(metrics['counters']['requests'], 1)
+        self.assertLessEqual(metrics['counters']['bytes'], self._body_size(
+            'https://detail.tmall.com/item.htm?id=656308694954'))
+        self.assertGreater(metrics['counters']['bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
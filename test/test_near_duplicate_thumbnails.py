@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import io
+import os
+import tempfile
+import unittest
+
+import yt_dlp
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp_plugins.postprocessor.near_duplicate_thumbnails import NearDuplicateThumbnailsPP
+
+try:
+    import numpy
+    from PIL import Image
+except ImportError:
+    numpy = None
+
+
+def _png(pattern, size):
+    img = Image.fromarray(numpy.uint8(pattern)).resize((size, size), Image.BICUBIC)
+    buf = io.BytesIO()
+    img.save(buf, 'PNG')
+    return buf.getvalue()
+
+
+class _CapturePP(PostProcessor):
+    def run(self, info):
+        self.info = info
+        return [], info
+
+
+@unittest.skipIf(numpy is None, 'numpy and Pillow are required')
+class TestNearDuplicateThumbnails(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        y, x = numpy.mgrid[:64, :64]
+        gradient, checks = (x + y) * 2, ((x // 8 + y // 16) % 2) * 255
+        self.images = {
+            'https://img.example.com/0.png': _png(gradient, 64),
+            'https://img.example.com/1.png': _png(gradient, 256),
+            'https://img.example.com/2.png': _png(checks, 64),
+        }
+        self.warnings = []
+
+    def _process(self, when):
+        ydl = yt_dlp.YoutubeDL({
+            'quiet': True, 'skip_download': True, 'write_all_thumbnails': True, 'cachedir': False,
+            'outtmpl': os.path.join(self._tmpdir.name, '%(id)s.%(ext)s')})
+        self.addCleanup(ydl.close)
+        ydl.urlopen = lambda req: io.BytesIO(self.images[req.url])
+        ydl.report_warning = lambda msg, *args, **kwargs: self.warnings.append(msg)
+        ydl.add_post_processor(NearDuplicateThumbnailsPP(ydl), when=when)
+        capture = _CapturePP(ydl)
+        ydl.add_post_processor(capture, when='before_dl')
+        ydl.process_ie_result({
+            'id': 'v', 'title': 'v', 'url': 'https://video.example.com/v.mp4', 'ext': 'mp4',
+            'thumbnails': [{'id': str(n), 'url': url} for n, url in enumerate(self.images)],
+        })
+        return capture.info
+
+    def test_before_dl(self):
+        info = self._process('before_dl')
+        self.assertEqual([t['id'] for t in info['thumbnails']], ['1', '2'])
+        self.assertEqual(sorted(os.listdir(self._tmpdir.name)), ['v.1.png', 'v.2.png'])
+        self.assertEqual(self.warnings, [])
+
+    def test_video_warns(self):
+        info = self._process('video')
+        self.assertEqual(len(info['thumbnails']), 3)
+        self.assertEqual(len(os.listdir(self._tmpdir.name)), 3)
+        self.assertEqual(len(self.warnings), 1)
+        self.assertIn('when=before_dl', self.warnings[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
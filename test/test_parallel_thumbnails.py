@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import io
+import os
+import tempfile
+import unittest
+
+import yt_dlp
+from yt_dlp_plugins.postprocessor.parallel_thumbnails import ParallelThumbnailsPP
+
+
+class TestParallelThumbnails(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.ydl = yt_dlp.YoutubeDL({
+            'quiet': True, 'outtmpl': os.path.join(self._tmpdir.name, '%(id)s.%(ext)s')})
+        self.fetched = []
+
+        def urlopen(req):
+            self.fetched.append(req.url)
+            return io.BytesIO(self.images[req.url])
+
+        self.ydl.urlopen = urlopen
+        self.pp = ParallelThumbnailsPP(self.ydl, workers=2)
+
+    def tearDown(self):
+        self.ydl.close()
+        self._tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self._tmpdir.name, name)
+
+    def _run(self, contents):
+        self.images = {f'https://img.example.com/{n}.jpg': data for n, data in enumerate(contents)}
+        info = {'id': 'v', 'title': 'v', 'ext': 'mp4', 'thumbnails': [
+            {'id': str(n), 'url': url} for n, url in enumerate(self.images)]}
+        return self.pp.run(info)[1]['thumbnails']
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_dedupe(self):
+        kept = self._run([b'a', b'b', b'a', b'c'])
+        self.assertEqual([t['id'] for t in kept], ['0', '1', '3'])
+        self.assertEqual(len(self.fetched), 4)
+        self.assertEqual([self._read(t['filepath']) for t in kept], [b'a', b'b', b'c'])
+        self.assertEqual(kept[0]['filepath'], self._path('v.0.jpg'))
+
+    def test_files_on_disk(self):
+        for n, data in enumerate([b'a', b'b']):
+            with open(self._path(f'v.{n}.jpg'), 'wb') as f:
+                f.write(data)
+        kept = self._run([b'a', b'b', b'c'])
+        self.assertEqual(self.fetched, ['https://img.example.com/2.jpg'])
+        self.assertEqual([self._read(t['filepath']) for t in kept], [b'a', b'b', b'c'])
+
+    def test_single_left(self):
+        with open(self._path('v.1.jpg'), 'wb') as f:
+            f.write(b'a')
+        kept = self._run([b'a', b'a'])
+        self.assertEqual(len(self.fetched), 1)
+        self.assertEqual([(t['id'], t['filepath']) for t in kept], [('0', self._path('v.jpg'))])
+        self.assertEqual(self._read(self._path('v.jpg')), b'a')
+
+    def test_stale_unindexed_file(self):
+        # From an earlier --write-thumbnail: not any particular one of these
+        with open(self._path('v.jpg'), 'wb') as f:
+            f.write(b'old')
+        kept = self._run([b'a', b'b', b'c', b'd'])
+        self.assertEqual(len(self.fetched), 4)
+        self.assertEqual([self._read(t['filepath']) for t in kept], [b'a', b'b', b'c', b'd'])
+
+        for t in kept:
+            os.remove(t['filepath'])
+        self.fetched.clear()
+        kept = self._run([b'a', b'a'])
+        self.assertEqual(len(self.fetched), 2)
+        self.assertEqual([t['filepath'] for t in kept], [self._path('v.jpg')])
+        self.assertEqual(self._read(self._path('v.jpg')), b'a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import time
+import unittest
+from unittest import mock
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp_plugins.extractor._cookies import current_account
+from yt_dlp_plugins.extractor._ratelimit import HostRateLimiter
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    def test_burst(self):
+        limiter = HostRateLimiter(rate=1000, burst=3)
+        self.assertEqual([limiter.acquire('a.com') for _ in range(3)], [0, 0, 0])
+        self.assertGreater(limiter.acquire('a.com'), 0)
+        self.assertEqual(limiter.acquire('b.com'), 0)
+        self.assertEqual(limiter.stats()['a.com']['requests'], 4)
+
+    def test_rate(self):
+        limiter = HostRateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire('a.com')
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 * 0.9)
+
+    def test_feedback(self):
+        limiter = HostRateLimiter(rate=4, burst=2, min_rate=1)
+        limiter.feedback('a.com', True)
+        self.assertEqual(limiter.stats()['a.com']['rate'], 2)
+        self.assertEqual(limiter.stats()['a.com']['tokens'], 0)
+        limiter.feedback('a.com', True)
+        limiter.feedback('a.com', True)
+        self.assertEqual(limiter.stats()['a.com']['rate'], 1)
+        self.assertEqual(limiter.stats()['a.com']['throttled'], 3)
+        for _ in range(5):
+            limiter.feedback('a.com', False)
+        self.assertEqual(limiter.stats()['a.com']['rate'], 3)
+        for _ in range(5):
+            limiter.feedback('a.com', False)
+        self.assertEqual(limiter.stats()['a.com']['rate'], 4)
+        self.assertNotIn('b.com', limiter.stats())
+
+    def test_shared(self):
+        limiter = HostRateLimiter.shared()
+        self.assertIs(HostRateLimiter.shared(), limiter)
+        rate, burst = limiter.rate, limiter.burst
+        try:
+            HostRateLimiter.shared(rate=7, burst=9)
+            self.assertEqual((limiter.rate, limiter.burst), (7, 9))
+        finally:
+            limiter.rate, limiter.burst = rate, burst
+
+
+class _Account:
+    def __init__(self, name):
+        self.name = name
+        self.jar = None
+
+
+class _Response:
+    status = 200
+
+    def __init__(self, url):
+        self.url = url
+
+
+class TestPluginRequests(unittest.TestCase):
+    def setUp(self):
+        self.limiter = HostRateLimiter(rate=1000, burst=5)
+        patcher = mock.patch.object(HostRateLimiter, 'shared', return_value=self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ydl = yt_dlp.YoutubeDL({'quiet': True})
+        self.addCleanup(self.ydl.close)
+        self.ie = self.ydl.get_info_extractor('Taobao')
+
+    def _request(self, final_url, account=None):
+        token = current_account.set(account)
+        try:
+            with mock.patch.object(InfoExtractor, '_request_webpage', return_value=_Response(final_url)):
+                self.ie._request_webpage('https://item.taobao.com/item.htm?id=1', '1')
+        finally:
+            current_account.reset(token)
+
+    def test_bucket_per_host(self):
+        self._request('https://item.taobao.com/item.htm?id=1')
+        self._request('https://login.taobao.com/member/login.jhtml')
+        self.assertEqual(list(self.limiter.stats()), ['item.taobao.com'])
+        self.assertEqual(self.limiter.stats()['item.taobao.com']['throttled'], 1)
+
+    def test_bucket_per_account(self):
+        first, second = _Account('first.txt'), _Account('second.txt')
+        self._request('https://login.taobao.com/member/login.jhtml', first)
+        for _ in range(3):
+            self._request('https://item.taobao.com/item.htm?id=1', second)
+        stats = self.limiter.stats()
+        self.assertEqual(set(stats), {'item.taobao.com (first.txt)', 'item.taobao.com (second.txt)'})
+        self.assertEqual(stats['item.taobao.com (first.txt)']['rate'], 500)
+        self.assertEqual(stats['item.taobao.com (second.txt)']['rate'], 1000)
+        self.assertEqual(stats['item.taobao.com (second.txt)']['requests'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
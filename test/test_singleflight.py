@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import threading
+import unittest
+
+import yt_dlp
+from yt_dlp_taobao.singleflight import SingleFlight, flight_key
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _overlapping(self, flights, key, func, callers=4):
+        """Run callers overlapping calls of func under key; return their outcomes"""
+        outcomes, started = [], threading.Barrier(callers)
+
+        def call():
+            started.wait()
+            try:
+                outcomes.append(flights.do(key, func))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return outcomes
+
+    def test_coalesces(self):
+        flights, calls, release = SingleFlight(), [], threading.Event()
+
+        def extract():
+            calls.append(None)
+            release.wait(10)
+            return {'id': '1'}
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        outcomes = self._overlapping(flights, ('Tmall', '1'), extract)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in outcomes), [False, True, True, True])
+        self.assertTrue(all(result is outcomes[0][0] for result, _ in outcomes))
+
+    def test_shares_errors(self):
+        flights, release = SingleFlight(), threading.Event()
+
+        def extract():
+            release.wait(10)
+            raise ValueError('gone')
+
+        threading.Timer(0.2, release.set).start()
+        outcomes = self._overlapping(flights, 'key', extract)
+        self.assertEqual(len(outcomes), 4)
+        self.assertTrue(all(isinstance(e, ValueError) for e in outcomes))
+
+    def test_sequential_calls_run_again(self):
+        flights, calls = SingleFlight(), []
+        for _ in range(3):
+            self.assertEqual(flights.do('key', calls.append, 1), (None, False))
+        self.assertEqual(calls, [1, 1, 1])
+
+    def test_keys_are_independent(self):
+        flights = SingleFlight()
+        inner = flights.do('outer', lambda: flights.do('inner', lambda: 'x'))
+        self.assertEqual(inner, (('x', False), False))
+
+
+class TestFlightKey(unittest.TestCase):
+    def test_flight_key(self):
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            self.assertEqual(flight_key(ydl, 'https://detail.tmall.com/item.htm?id=656308694954'),
+                             ('Tmall', None, '656308694954'))
+            self.assertEqual(flight_key(ydl, 'https://example.com/item'), (None, None, 'https://example.com/item'))
+
+    def test_ids_per_host(self):
+        with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
+            keys = {flight_key(ydl, url) for url in (
+                'https://www.amazon.com/dp/B0845NXCXF', 'https://amazon.com/dp/B0845NXCXF?th=1',
+                'https://www.amazon.co.uk/dp/B0845NXCXF')}
+            self.assertEqual(keys, {('AmazonStore', 'amazon.com', 'B0845NXCXF'),
+                                    ('AmazonStore', 'amazon.co.uk', 'B0845NXCXF')})
+            self.assertEqual(flight_key(ydl, 'https://www.ebay.com/itm/194509326719'),
+                             ('Ebay', 'ebay.com', '194509326719'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import io
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.networking.exceptions import TransportError
+from yt_dlp.utils import ExtractorError
+from yt_dlp_plugins.extractor._cache import ProductCache
+from yt_dlp_plugins.extractor._common import ExtractionMetrics, ItemNotFoundError, _current_metrics
+from yt_dlp_plugins.extractor._taobao import _TMALL_FIELDS, _TSHOP_SETUP_RE
+
+HEAD = (
+    '<html><head><title>Áo khoác</title></head>\n'
+    '<script>var g_config = {"itemDO":{"imgVedioID":"300000000001","userId":"2200000000001"}};</script>\n')
+PADDING = ''.join(f'<p>Mô tả sản phẩm, dòng {n}</p>\n' for n in range(20000))
+
+
+class _Response:
+    """Item page response that records how much of it was read"""
+
+    def __init__(self, body, fail_after=None, final_url='https://detail.tmall.com/item.htm?id=656308694954'):
+        self.url = final_url
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.status = 200
+        self.consumed = 0
+        self.closed = False
+        self._body = io.BytesIO(body.encode('utf-8'))
+        self._fail_after = fail_after
+
+    def read(self, size=-1):
+        if self._fail_after is not None and self.consumed >= self._fail_after:
+            raise TransportError('Connection reset by peer')
+        data = self._body.read(size)
+        self.consumed += len(data)
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class TestDownloadWebpageUntil(unittest.TestCase):
+    def setUp(self):
+        self.ydl = yt_dlp.YoutubeDL({'quiet': True, 'extractor_args': {'yt_dlp_taobao': {'rate_limit': ['0']}}})
+        self.ie = self.ydl.get_info_extractor('Tmall')
+        self.metrics = ExtractionMetrics('tmall:product', 'https://detail.tmall.com/item.htm?id=656308694954')
+        token = _current_metrics.set(self.metrics)
+        self.addCleanup(_current_metrics.reset, token)
+
+    def tearDown(self):
+        self.ydl.close()
+
+    def _download(self, body, fields=_TMALL_FIELDS.patterns.values(), **kwargs):
+        self.response = _Response(body, **kwargs)
+        with mock.patch.object(InfoExtractor, '_request_webpage', return_value=self.response):
+            return self.ie._download_webpage_until(self.response.url, '656308694954', lambda url: fields)[0]
+
+    def test_stops_early(self):
+        webpage = self._download(HEAD + PADDING)
+        self.assertTrue(self.response.closed)
+        self.assertLess(self.response.consumed, len((HEAD + PADDING).encode('utf-8')))
+        self.assertEqual(self.ie._scan_fields(_TMALL_FIELDS, webpage), {
+            'video id': '300000000001', 'video uid': '2200000000001', 'title': 'Áo khoác'})
+        self.assertEqual(self.metrics.counters['bytes'], self.response.consumed)
+        self.assertEqual(self.metrics.counters['requests'], 1)
+
+    def test_reads_all_without_field(self):
+        body = HEAD.replace('imgVedioID', 'imgVideoID') + PADDING
+        webpage = self._download(body)
+        self.assertEqual(webpage, body)
+        self.assertEqual(self.response.consumed, len(body.encode('utf-8')))
+        self.assertEqual(self.metrics.counters['bytes'], self.response.consumed)
+
+    def test_no_fields(self):
+        self.assertEqual(self._download(HEAD + PADDING, fields=()), HEAD + PADDING)
+
+    def test_read_error(self):
+        with self.assertRaisesRegex(ExtractorError, 'Error reading response') as cm:
+            self._download(HEAD.replace('imgVedioID', 'imgVideoID') + PADDING, fail_after=200000)
+        self.assertIsInstance(cm.exception.cause, TransportError)
+        self.assertTrue(self.response.closed)
+
+    def test_blocked(self):
+        with self.assertRaisesRegex(ExtractorError, 'Indian censorship'):
+            self._download('<title>The URL you requested has been blocked</title>\n' + PADDING)
+
+    def test_tshop_setup(self):
+        setup = '<script>TShop.Setup({"a":"f();","b":{"c":[1]}});foo();bar({});</script>\n'
+        self.assertEqual(re.search(_TSHOP_SETUP_RE, setup).group(), 'TShop.Setup({"a":"f();","b":{"c":[1]}});')
+        self.assertIsNone(re.search(_TSHOP_SETUP_RE, 'TShop.Setup({"a":\n1});'))
+        self._download(HEAD + setup + PADDING, fields=(*_TMALL_FIELDS.patterns.values(), _TSHOP_SETUP_RE))
+        self.assertLess(self.response.consumed, 200000)
+
+
+class TestTaobaoWorldNotFound(unittest.TestCase):
+    URL = 'https://world.taobao.com/item/643681750378.htm'
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.ydl = yt_dlp.YoutubeDL({'quiet': True, 'cachedir': self._tmpdir.name, 'extractor_args': {
+            'yt_dlp_taobao': {'not_found_ttl': ['60'], 'rate_limit': ['0']}}})
+        self.ie = self.ydl.get_info_extractor('TaobaoWorld')
+        self.requests = 0
+
+    def tearDown(self):
+        self.ydl.close()
+        for path in [path for path in ProductCache._instances if path.startswith(self._tmpdir.name)]:
+            ProductCache._instances.pop(path)._conn.close()
+        self._tmpdir.cleanup()
+
+    def _extract(self, final_url):
+        def download(url, video_id, *args, **kwargs):
+            self.requests += 1
+            return '<html><head><title>Taobao</title></head></html>', _Response('', final_url=final_url)
+
+        self.ie._download_webpage_handle = download
+        with self.assertRaises(ExtractorError) as cm:
+            self.ie.extract(self.URL)
+        return cm.exception
+
+    def test_interstitial_not_cached(self):
+        for final_url in (self.URL, 'https://world.taobao.com/_____tmd_____/punish?x5secdata=1',
+                          'https://world.taobao.com/item/643681750378.htm?captcha=1'):
+            with self.subTest(final_url):
+                self.assertNotIsInstance(self._extract(final_url), ItemNotFoundError)
+        self.assertEqual(self.requests, 3)
+        self._extract(self.URL)
+        self.assertEqual(self.requests, 4)
+
+    def test_removed_item_cached(self):
+        self.assertIsInstance(self._extract('https://world.taobao.com/'), ItemNotFoundError)
+        self.assertIsInstance(self._extract('https://world.taobao.com/'), ItemNotFoundError)
+        self.assertEqual(self.requests, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
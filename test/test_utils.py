@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import json
+import unittest
+
+from yt_dlp_plugins.extractor._utils import (
+    FieldScanner,
+    ScriptIndex,
+    alicdn_image_key,
+    amazon_image_key,
+    canonical_alicdn_url,
+    item_host,
+    locate_json,
+    unique_thumbnails,
+)
+
+
+class TestScriptIndex(unittest.TestCase):
+    PAGE = (
+        '<html><script>var a = "videoId";</script>'
+        '<script type="application/json" data-content-len="30" data-sjs>{"videoId": 1, "playable_url": "x"}</script>'
+        '<script src="s.js"></script>'
+        '<script data-sjs>not json "playable_url"</script>'
+        '<script nonce="n">{"other": true}</script></html>')
+
+    def test_markers(self):
+        index = ScriptIndex(self.PAGE, ('videoId', 'playable_url', 'missing'))
+        self.assertEqual(len(index.blocks), 5)
+        self.assertEqual([content for _, content in index.find('videoId')],
+                         ['var a = "videoId";', '{"videoId": 1, "playable_url": "x"}'])
+        self.assertEqual(len(list(index.find('playable_url'))), 2)
+        self.assertEqual(list(index.find('missing')), [])
+
+    def test_data_sjs(self):
+        index = ScriptIndex(self.PAGE, ('videoId', 'playable_url'))
+        self.assertEqual([content for _, content in index.find('playable_url', data_sjs=True)],
+                         ['{"videoId": 1, "playable_url": "x"}'])
+        self.assertEqual(index.search(r'"videoId":\s*(\d+)', 'videoId', data_sjs=True), '1')
+        self.assertIsNone(index.search(r'var a = "(\w+)"', 'videoId', data_sjs=True))
+        self.assertEqual(index.search((r'nothing', r'var a = "(\w+)"'), 'videoId'), 'videoId')
+
+    def test_decode_memoized(self):
+        index = ScriptIndex(self.PAGE, ('videoId', ))
+        calls = []
+
+        def transform(content):
+            calls.append(content)
+            return json.loads(content)
+
+        offset = list(index.find('videoId', data_sjs=True))[0][0]
+        first = index.decode(offset, transform)
+        self.assertEqual(first, {'videoId': 1, 'playable_url': 'x'})
+        self.assertIs(index.decode(offset, transform), first)
+        self.assertEqual(len(calls), 1)
+
+
+class TestAlicdn(unittest.TestCase):
+    def test_canonical_url(self):
+        base = 'https://cbu01.alicdn.com/img/ibank/O1CN01abcdefgh_!!220-0-cib'
+        for variant in ('.jpg', '.220x220.jpg', '.summ.jpg', '.search.jpg', '.jpg_430x430q90.jpg', '.jpg_.webp',
+                        '.310x310.jpg_.webp'):
+            with self.subTest(variant):
+                self.assertEqual(canonical_alicdn_url(base + variant), base + '.jpg')
+
+    def test_canonical_scheme(self):
+        url = 'https://img.alicdn.com/imgextra/i1/O1CN01abcdefgh_!!1.png'
+        for prefix in ('', '//', 'http://', 'https://', '  //'):
+            with self.subTest(prefix):
+                self.assertEqual(canonical_alicdn_url(prefix + url[len('https://'):]), url)
+
+    def test_image_key(self):
+        self.assertEqual(alicdn_image_key('//img.alicdn.com/imgextra/i2/O1CN01abcdefgh_!!1.jpg_.webp'), 'O1CN01abcdefgh')
+        self.assertEqual(
+            alicdn_image_key('https://cbu01.alicdn.com/img/ibank/2019/123/456.220x220.jpg'), '/img/ibank/2019/123/456.jpg')
+
+    def test_unique_thumbnails(self):
+        self.assertEqual(unique_thumbnails(
+            ('gallery', ['//img.alicdn.com/imgextra/i1/O1CN01aaaaaaaa_!!1.jpg_430x430.jpg',
+                         '//img.alicdn.com/imgextra/i1/O1CN01bbbbbbbb_!!1.jpg']),
+            ('sku', ['https://img.alicdn.com/imgextra/i4/O1CN01aaaaaaaa_!!1.jpg']),
+            ('description', ['https://cbu01.alicdn.com/img/ibank/O1CN01cccccccc_!!1.summ.jpg',
+                             '//img.alicdn.com/imgextra/i1/O1CN01bbbbbbbb_!!1.jpg_.webp']),
+        ), [
+            {'url': 'https://img.alicdn.com/imgextra/i1/O1CN01aaaaaaaa_!!1.jpg', 'sources': ['gallery', 'sku']},
+            {'url': 'https://img.alicdn.com/imgextra/i1/O1CN01bbbbbbbb_!!1.jpg', 'sources': ['gallery', 'description']},
+            {'url': 'https://cbu01.alicdn.com/img/ibank/O1CN01cccccccc_!!1.jpg', 'sources': ['description']},
+        ])
+
+
+class TestLocateJson(unittest.TestCase):
+    def test_object(self):
+        page = 'var a = 1;window.__INIT_DATA= {"a": {"b": [1, 2]}, "c": "}"};foo({"d": 1});'
+        self.assertEqual(locate_json(page, r'window\.__INIT_DATA\s*='), {'a': {'b': [1, 2]}, 'c': '}'})
+
+    def test_array(self):
+        self.assertEqual(locate_json('x = [["PICTURE0-0", 0]], y', r'x\s*=\s*'), [['PICTURE0-0', 0]])
+
+    def test_escapes(self):
+        page = r'd={"html": "<a href=\"x\">{[</a>", "u": "á"}; trailing } ]'
+        self.assertEqual(locate_json(page, 'd='), {'html': '<a href="x">{[</a>', 'u': 'á'})
+
+    def test_missing(self):
+        self.assertIsNone(locate_json('nothing here', r'window\.__INIT_DATA\s*='))
+        self.assertIsNone(locate_json('d = 12;', r'd\s*='))
+        self.assertIsNone(locate_json('d = {"a": 1', r'd\s*='))
+
+
+class TestFieldScanner(unittest.TestCase):
+    FIELDS = FieldScanner({
+        'video id': r'"videoId":(\d+)',
+        'title': r'<title>([^<]+)<',
+        'user id': r'"userId":"(\d+)"|userId=(\d+)',
+        'price': r'"price":"([^"]+)"',
+    })
+
+    def test_scan(self):
+        page = '<title>Item</title>"videoId":123,"videoId":456; userId=789'
+        self.assertEqual(self.FIELDS.scan(page), {'video id': '123', 'title': 'Item', 'user id': '789'})
+
+    def test_matches_search_regex_groups(self):
+        self.assertEqual(FieldScanner({'all': r'"id":\d+'}).scan('{"id":42}'), {'all': '"id":42'})
+        self.assertEqual(self.FIELDS.scan(''), {})
+
+
+class TestItemHost(unittest.TestCase):
+    def test_item_host(self):
+        self.assertEqual(item_host('https://www.Amazon.co.uk/dp/B0845NXCXF'), 'amazon.co.uk')
+        self.assertEqual(item_host('https://smile.amazon.com/dp/B0845NXCXF'), 'smile.amazon.com')
+        self.assertEqual(item_host('https://ebay.de/itm/1'), 'ebay.de')
+
+
+class TestAmazonImageKey(unittest.TestCase):
+    def test_modifiers(self):
+        key = amazon_image_key('https://m.media-amazon.com/images/I/61abc.jpg')
+        self.assertEqual(amazon_image_key('https://m.media-amazon.com/images/I/61abc._AC_SL1500_.jpg'), key)
+        self.assertEqual(amazon_image_key('https://images-na.ssl-images-amazon.com/images/I/61abc._SX38_SY50_.jpg'), key)
+        self.assertNotEqual(amazon_image_key('https://m.media-amazon.com/images/I/61abd._AC_SL1500_.jpg'), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
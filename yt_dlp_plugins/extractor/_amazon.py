@@ -0,0 +1,226 @@
+import re
+import urllib.parse
+
+from yt_dlp.utils import (
+    RegexNotFoundError,
+    clean_html,
+    float_or_none,
+    get_element_by_attribute,
+    get_element_by_class,
+    int_or_none,
+    js_to_json,
+    traverse_obj,
+    unescapeHTML,
+    url_or_none,
+)
+
+from yt_dlp.extractor.amazon import AmazonStoreIE
+
+from ._common import NO_VIDEO_URL, PluginBaseIE
+from ._utils import amazon_image_key, plugin_arg
+
+
+class AmazonStoreIE_GetThumb(AmazonStoreIE, PluginBaseIE, plugin_name='amz_getimg'):
+    """Product images and video of an Amazon listing
+
+    With --extractor-args "yt_dlp_taobao:variants=N" the galleries of up to N
+    sibling variants (sizes, styles, ...) of the twister are fetched in the
+    background and merged into the thumbnails, unless images_only is given.
+    With cache_ttl set, each variant's gallery is kept in the product cache
+    of its marketplace for that long.
+    """
+    _ITEM_IDS_PER_HOST = True
+    _VALID_URL = r'https?://(?:www\.)?amazon\.(?:[a-z]{2,3})(?:\.[a-z]{2})?/(?:[^/]+/)?(?:dp|gp/product)/(?P<id>[^/&#$?]+)'
+
+    _TESTS = [{
+        'url': 'https://www.amazon.co.uk/dp/B098XNCHLD/',
+        'info_dict': {
+            'id': 'B098XNCHLD',
+            'title': str,
+        },
+        'playlist_mincount': 1,
+        'playlist': [{
+            'info_dict': {
+                'id': 'A1F83G8C2ARO7P',
+                'ext': 'mp4',
+                'title': 'mcdodo usb c cable 100W 5a',
+                'thumbnail': r're:^https?://.*\.jpg$',
+                'duration': 34,
+            },
+        }],
+        'expected_warnings': ['Unable to extract data'],
+    }, {
+        'url': 'https://www.amazon.in/Sony-WH-1000XM4-Cancelling-Headphones-Bluetooth/dp/B0863TXGM3',
+        'info_dict': {
+            'id': 'B0863TXGM3',
+            'title': str,
+        },
+        'playlist_mincount': 4,
+        'expected_warnings': ['Unable to extract data'],
+    }, {
+        'url': 'https://www.amazon.com/dp/B0845NXCXF/',
+        'info_dict': {
+            'id': 'B0845NXCXF',
+            'title': str,
+        },
+        'playlist-mincount': 1,
+        'expected_warnings': ['Unable to extract data'],
+    }, {
+        'url': 'https://www.amazon.es/Samsung-Smartphone-s-AMOLED-Quad-c%C3%A1mara-espa%C3%B1ola/dp/B08WX337PQ',
+        'info_dict': {
+            'id': 'B08WX337PQ',
+            'title': str,
+        },
+        'playlist_mincount': 1,
+        'expected_warnings': ['Unable to extract data'],
+    }]
+    # In-page sources of the product data, best first; the later ones only
+    # fill the fields of the jQuery.parseJSON blob that the code below reads
+    _DATA_SOURCES = ('parse_json', 'image_block', 'dynamic_image')
+
+    def _product_title(self, webpage):
+        return (clean_html(get_element_by_attribute('id', 'productTitle', webpage))
+                or self._html_extract_title(webpage, default=None))
+
+    def _data_from_parse_json(self, webpage, id):
+        return self._search_json(
+            r'var\s?obj\s?=\s?jQuery\.parseJSON\(\'', webpage, 'data', id,
+            transform_source=js_to_json, default=None)
+
+    def _data_from_image_block(self, webpage, id):
+        # P.when('A').register("ImageBlockATF", ...): 'colorImages': { 'initial': [...] }
+        images = self._locate_json(r"'colorImages'\s*:\s*\{\s*'initial'\s*:", webpage, 'image block', default=None)
+        if not images:
+            return None
+        videos = self._locate_json(r"'videos'\s*:", webpage, 'videos', default=None) or []
+        return {
+            'title': self._product_title(webpage),
+            'mediaAsin': id,
+            'videos': [video for video in videos if isinstance(video, dict) and video.get('marketPlaceID')],
+            'colorImages': {'initial': images},
+        }
+
+    def _data_from_dynamic_image(self, webpage, id):
+        # <img id="landingImage" data-a-dynamic-image="{&quot;URL&quot;:[WIDTH,HEIGHT],...}">: one image in several sizes
+        sizes = self._search_json(
+            r'data-a-dynamic-image\s*=\s*"', webpage, 'dynamic image', id,
+            contains_pattern=r'\{[^"]+\}', transform_source=unescapeHTML, default=None)
+        if not sizes:
+            return None
+        return {
+            'title': self._product_title(webpage),
+            'mediaAsin': id,
+            'colorImages': {'initial': [{'hiRes': max(sizes, key=lambda url: sizes[url][0] * sizes[url][1])}]},
+        }
+
+    def _product_data(self, webpage, id):
+        """Product data from the first in-page source that has it, or None"""
+        for source in self._DATA_SOURCES:
+            data = getattr(self, f'_data_from_{source}')(webpage, id)
+            if data:
+                if source != self._DATA_SOURCES[0]:
+                    self.write_debug(f'{id}: No {self._DATA_SOURCES[0]} data; using {source}')
+                return data
+        return None
+
+    @staticmethod
+    def _hires_images(data_json):
+        jsonImage = data_json.get('colorImages')
+        return [
+            colorimg['hiRes'] for i in (jsonImage or {}) for colorimg in jsonImage[i]
+            if colorimg.get('hiRes')]
+
+    def _variant_asins(self, webpage, data_json, id):
+        """ASINs of the other variants in the twister, in page order"""
+        for anchor in (r'"dimensionValuesDisplayData"\s*:', r'"asinVariationValues"\s*:'):
+            variations = self._locate_json(anchor, webpage, 'variations', default=None)
+            if variations and isinstance(variations, dict):
+                break
+        else:
+            variations = dict.fromkeys(
+                value.get('asin') for value in (data_json.get('colorToAsin') or {}).values()
+                if isinstance(value, dict))
+        return [asin for asin in variations if asin and asin != id and re.fullmatch(r'[0-9A-Z]{10}', asin)]
+
+    def _variant_images(self, url, asin):
+        """hiRes gallery of a variant, from the product cache if it has it"""
+        ttl = float_or_none(plugin_arg(self, 'cache_ttl'))
+        cache = ttl and self._product_store()
+        site = f'{self._item_site(url)}:images'
+        if cache:
+            cached = cache.get(site, asin)
+            if cached:
+                return cached['images']
+        webpage = self._download_webpage(
+            urllib.parse.urljoin(url, f'/dp/{asin}?th=1&psc=1'), asin,
+            f'Downloading images of variant {asin}', fatal=False)
+        data_json = webpage and self._product_data(webpage, asin)
+        if not data_json:
+            self.report_warning(f'{asin}: Unable to extract the images of this variant')
+            return []
+        images = self._hires_images(data_json)
+        if cache:
+            cache.put(site, asin, {'images': images}, ttl)
+        return images
+
+    def _real_extract(self, url):
+        id = self._match_id(url)
+        return self._with_negative_cache(url, id, self._extract_product, url, id)
+
+    def _extract_product(self, url, id):
+        # Download again only if no known source is on the page (captcha etc.)
+        for retry in self.RetryManager():
+            webpage = self._download_webpage(url, id)
+            data_json = self._product_data(webpage, id)
+            if data_json is None:
+                retry.error = RegexNotFoundError('Unable to extract data')
+        title = data_json.get('title') or ""
+        vid = data_json.get('mediaAsin') or ""
+        videolst = []
+        for video in (data_json.get('videos') or []):
+            if video.get('isVideo') and video.get('url'):
+                vid = video['marketPlaceID']
+                videolst.append({
+                    'id': video['marketPlaceID'],
+                    'url': video['url'],
+                    'title': video.get('title'),
+                    'thumbnail': video.get('thumbUrl') or video.get('thumb'),
+                    'duration': video.get('durationSeconds'),
+                    'height': int_or_none(video.get('videoHeight')),
+                    'width': int_or_none(video.get('videoWidth')),
+                })
+        # print(videolst)
+        hires = self._hires_images(data_json)
+        max_variants = int_or_none(plugin_arg(self, 'variants'))
+        if max_variants and not self._images_only():
+            variants = [
+                self._submit_background(self._variant_images, url, asin)
+                for asin in self._variant_asins(webpage, data_json, id)[:max_variants]]
+            for variant in variants:
+                hires.extend(variant.result())
+        unique = {}
+        for image in hires:
+            unique.setdefault(amazon_image_key(image), {'url': image})
+        imagelst = list(unique.values())
+        formats = []
+        if not videolst:
+            formats.append({
+                'url': NO_VIDEO_URL,
+                'ext': 'mp4',
+                'format_id': 'http-mp4',
+            })
+        else:
+            formats.append({
+                'url': videolst[0]['url'],
+                'ext': 'mp4',
+                'format_id': 'http-mp4',
+            })
+        # print(imagelst)
+        if not formats:
+            self.raise_no_formats('No video found for this customer review', expected=True)
+        return {
+            'id': vid,
+            'title': title,
+            'thumbnails': imagelst,
+            'formats': formats,
+        }
\ No newline at end of file
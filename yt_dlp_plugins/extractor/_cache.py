@@ -0,0 +1,87 @@
+# coding: utf-8
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ProductCache:
+    """SQLite store of finished info dicts keyed by (site, item id)
+
+    Every entry carries its own expiry time. Once the stored info dicts
+    outgrow max_bytes, the oldest entries are evicted first.
+
+    A second table holds negative outcomes, such as a listing without video
+    or one that is gone, each with the payload needed to answer it again.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path, max_bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS products (
+            site TEXT NOT NULL, item_id TEXT NOT NULL, stored REAL NOT NULL, expires REAL NOT NULL,
+            info BLOB NOT NULL, PRIMARY KEY (site, item_id))''')
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS negative (
+            site TEXT NOT NULL, item_id TEXT NOT NULL, outcome TEXT NOT NULL, expires REAL NOT NULL,
+            payload BLOB NOT NULL, PRIMARY KEY (site, item_id))''')
+
+    @classmethod
+    def open(cls, path, max_bytes):
+        """Return the cache for path, shared by every extractor of the process"""
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, max_bytes)
+            cache = cls._instances[path]
+            cache.max_bytes = max_bytes
+            return cache
+
+    def get(self, site, item_id):
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT info FROM products WHERE site = ? AND item_id = ? AND expires > ?',
+                (site, item_id, time.time())).fetchone()
+        return row and json.loads(row[0])
+
+    def put(self, site, item_id, info, ttl):
+        now = time.time()
+        data = json.dumps(info, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)',
+                (site, item_id, now, now + ttl, data))
+            self._conn.execute('DELETE FROM products WHERE expires <= ?', (now, ))
+            # Keep the newest entries that fit in max_bytes
+            self._conn.execute('''DELETE FROM products WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(LENGTH(info)) OVER (ORDER BY stored DESC) AS total FROM products)
+                WHERE total > ?)''', (self.max_bytes, ))
+
+    def get_negative(self, site, item_id):
+        """Return (outcome, payload) of an unexpired negative entry, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT outcome, payload FROM negative WHERE site = ? AND item_id = ? AND expires > ?',
+                (site, item_id, time.time())).fetchone()
+        return row and (row[0], json.loads(row[1]))
+
+    def put_negative(self, site, item_id, outcome, payload, ttl):
+        now = time.time()
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO negative VALUES (?, ?, ?, ?, ?)',
+                (site, item_id, outcome, now + ttl, data))
+            self._conn.execute('DELETE FROM negative WHERE expires <= ?', (now, ))
+
+    def invalidate(self, site, item_id):
+        """Forget everything stored about an item; return whether there was anything"""
+        with self._lock:
+            deleted = sum(
+                self._conn.execute(f'DELETE FROM {table} WHERE site = ? AND item_id = ?', (site, item_id)).rowcount
+                for table in ('products', 'negative'))
+        return deleted > 0
@@ -0,0 +1,379 @@
+# coding: utf-8
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import NO_DEFAULT, ExtractorError, RegexNotFoundError, float_or_none
+
+from ._cache import ProductCache
+from ._cookies import current_account
+from ._ratelimit import HostRateLimiter
+from ._utils import item_host, locate_json, plugin_arg
+
+_NO_SPAN = contextlib.nullcontext()
+_current_metrics = contextvars.ContextVar('yt_dlp_taobao_metrics', default=None)
+# Where the sites send clients they want to slow down
+_PUSHBACK_URL_RE = re.compile(r'login\.jhtml|/_____tmd_____/|/punish\b|captcha', re.IGNORECASE)
+# Returned in place of the video of listings that have none
+NO_VIDEO_URL = 'http://bo.vutn.net/no-video.mp4'
+UNAVAILABLE_MSG = 'Không thể lấy video/ảnh, vui lòng kiểm tra lại liên kết hoặc liên hệ hỗ trợ'
+# Kinds of negative cache entry, each enabled by its OUTCOME_ttl argument
+_NEGATIVE_OUTCOMES = ('no_video', 'not_found')
+
+
+class LoginRedirectError(ExtractorError):
+    """The site sent us to its login page: the session cookies are missing or expired"""
+
+    def __init__(self, msg='Lỗi đăng nhập Taobao - Cookies Error - Vui lòng báo lỗi cho hỗ trợ @cpanel10x', **kwargs):
+        super().__init__(msg, expected=True, **kwargs)
+
+
+class ItemNotFoundError(ExtractorError):
+    """The listing does not exist (any more)
+
+    Only raised on a signal that the item itself is gone; a page that merely
+    lacks the expected fields may be an anti-bot interstitial.
+    """
+
+    def __init__(self, msg=UNAVAILABLE_MSG, **kwargs):
+        super().__init__(msg, expected=True, **kwargs)
+
+
+def _is_gone(err):
+    """Whether an extraction error says that the listing does not exist"""
+    if isinstance(err, ItemNotFoundError):
+        return True
+    if isinstance(err.cause, HTTPError) and err.cause.status in (404, 410):
+        # The error page of a captcha or login redirect says nothing about the item
+        return not _PUSHBACK_URL_RE.search(err.cause.response.url or '')
+    return False
+
+
+def is_no_video(info):
+    """Whether an info dict stands for a listing without video"""
+    return NO_VIDEO_URL in (info.get('url'), *(f.get('url') for f in info.get('formats') or ()))
+
+
+class ExtractionMetrics:
+    """Time spent per phase, and counters, of a single extraction"""
+
+    def __init__(self, extractor, url):
+        self.extractor = extractor
+        self.url = url
+        self.status = None
+        self.spans = collections.defaultdict(float)
+        self.counters = collections.defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.spans[phase] += elapsed
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def as_dict(self):
+        return {
+            'extractor': self.extractor,
+            'url': self.url,
+            'status': self.status,
+            'timestamp': round(time.time(), 3),
+            'spans': {phase: round(seconds, 6) for phase, seconds in self.spans.items()},
+            'counters': dict(self.counters),
+        }
+
+    def to_prometheus(self):
+        labels = f'extractor="{self.extractor}"'
+        lines = [
+            '# TYPE yt_dlp_taobao_extraction_success gauge',
+            f'yt_dlp_taobao_extraction_success{{{labels}}} {int(self.status == "ok")}',
+            '# TYPE yt_dlp_taobao_extraction_phase_seconds gauge',
+            *(f'yt_dlp_taobao_extraction_phase_seconds{{{labels},phase="{phase}"}} {seconds:.6f}'
+              for phase, seconds in self.spans.items()),
+            '# TYPE yt_dlp_taobao_extraction_count gauge',
+            *(f'yt_dlp_taobao_extraction_count{{{labels},name="{name}"}} {value}'
+              for name, value in self.counters.items()),
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """Append a JSON line to path, or rewrite it in Prometheus text format if it ends with .prom"""
+        if not path.endswith('.prom'):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.as_dict(), ensure_ascii=False) + '\n')
+            return
+        # One temporary file per export: several threads may write the same path
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=os.path.dirname(os.path.abspath(path)),
+                prefix=f'{os.path.basename(path)}.', suffix='.tmp', delete=False) as f:
+            f.write(self.to_prometheus())
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+
+class PluginBaseIE(InfoExtractor):
+    """Common base of the plugin extractors
+
+    Overriding extractors list it after the extractor they replace, so that it
+    sits between that one and InfoExtractor in the MRO.
+
+    With --extractor-args "yt_dlp_taobao:metrics=FILE" the time spent in
+    downloads, regex searches, JSON decoding and the phases marked with _span(),
+    plus requests made, body bytes read and thumbnails returned, are exported
+    per extraction. Waiting for the rate limiter is its own phase, not part
+    of the downloads.
+    When the option is not given, every hook costs a single ContextVar lookup.
+
+    Every request goes through the per-host HostRateLimiter shared by the
+    process, at up to rate_limit requests per second per host (default 2,
+    0 disables) in bursts of rate_burst (default 5). Requests made with the
+    cookies of a cookie_pool account get a bucket per host and account, so
+    more accounts mean more throughput and a login redirect only slows down
+    the account it was about.
+
+    With no_video_ttl=SECONDS, listings without video are remembered in the
+    negative table of the product cache for that long; not_found_ttl does
+    the same for listings that are gone. Neither is on by default. Entries
+    are keyed by _item_site(), which includes the host where item ids are
+    per host. cache_bypass ignores and replaces the entry, or
+    ProductCache.invalidate() drops it.
+
+    With images_only the extractors return title, metadata and pictures from
+    the pages they need anyway: manifests are represented by a format for
+    their URL instead of being fetched and parsed, and optional requests
+    (description pages, variants, captions, Facebook's secondary player
+    queries) are skipped. Such results are not complete (_is_complete) and
+    are never stored in the caches.
+    """
+    # Whether the same item id names different items on different hosts
+    # (Amazon marketplaces, eBay sites), so that the host is part of its key
+    _ITEM_IDS_PER_HOST = False
+    # Requests the extractors overlap with their own work, shared by all of
+    # them; a background task must not wait on another one
+    _BACKGROUND_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix='yt-dlp-taobao')
+
+    def extract(self, url):
+        path = plugin_arg(self, 'metrics', casesense=True)
+        if not path:
+            return super().extract(url)
+        metrics = ExtractionMetrics(self.IE_NAME, url)
+        token = _current_metrics.set(metrics)
+        try:
+            with metrics.span('total'):
+                info = super().extract(url)
+            metrics.count('thumbnails', len((info or {}).get('thumbnails') or []))
+            metrics.status = 'ok'
+            return info
+        except Exception:
+            metrics.status = 'error'
+            raise
+        finally:
+            _current_metrics.reset(token)
+            try:
+                metrics.export(path)
+            except OSError as e:
+                self.report_warning(f'Unable to write metrics to {path}: {e}')
+
+    def _span(self, phase):
+        """Context manager timing a phase of the running extraction"""
+        metrics = _current_metrics.get()
+        return metrics.span(phase) if metrics else _NO_SPAN
+
+    def _count(self, name, value=1):
+        """Add value to a counter of the running extraction"""
+        metrics = _current_metrics.get()
+        if metrics:
+            metrics.count(name, value)
+
+    def _submit_background(self, func, *args):
+        """Run func(*args) on the shared pool, in a copy of the current context
+
+        The copy carries the metrics and cookie pool account of the running
+        extraction over to the worker thread. Returns the Future.
+        """
+        return self._BACKGROUND_POOL.submit(contextvars.copy_context().run, func, *args)
+
+    def _images_only(self):
+        return plugin_arg(self, 'images_only') is not None
+
+    def _is_complete(self):
+        """Whether this extraction returns the full info and may be cached"""
+        return not self._images_only()
+
+    def _manifest_stub_format(self, url, kind):
+        """Format standing for an HLS or DASH manifest that images_only leaves unfetched"""
+        if kind == 'HLS':
+            return self._m3u8_meta_format(url, 'mp4', m3u8_id='hls')
+        return {
+            'format_id': 'dash-meta',
+            'url': url,
+            'ext': 'mpd',
+            'preference': -100,
+            'resolution': 'multiple',
+            'format_note': 'Quality selection URL',
+        }
+
+    def _product_store(self):
+        """The ProductCache of this process, or None if yt-dlp's cache is disabled"""
+        if not self.cache.enabled:
+            return None
+        max_mb = float_or_none(plugin_arg(self, 'cache_max_mb')) or 64
+        path = os.path.join(self.cache._get_root_dir(), 'yt-dlp-taobao', 'products.sqlite')
+        return ProductCache.open(path, int(max_mb * 1024 * 1024))
+
+    def _item_site(self, url):
+        """Site part of the cache keys of the item of url"""
+        if self._ITEM_IDS_PER_HOST:
+            return f'{self.ie_key()}:{item_host(url)}'
+        return self.ie_key()
+
+    def _negative_ttl(self, outcome):
+        return float_or_none(plugin_arg(self, f'{outcome}_ttl')) or 0
+
+    def _with_negative_cache(self, url, item_id, func, *args):
+        """Return func(*args), answering listings known to have no video or to be gone from the cache"""
+        store = self._product_store() if any(map(self._negative_ttl, _NEGATIVE_OUTCOMES)) else None
+        if store is None:
+            return func(*args)
+        site = self._item_site(url)
+        if plugin_arg(self, 'cache_bypass') is not None:
+            store.invalidate(site, item_id)
+        hit = store.get_negative(site, item_id)
+        if hit:
+            outcome, payload = hit
+            self.to_screen(f'{item_id}: Using cached "{outcome}" result')
+            if outcome == 'not_found':
+                raise ItemNotFoundError(payload)
+            return payload
+        try:
+            info = func(*args)
+        except ExtractorError as e:
+            if _is_gone(e):
+                ttl = self._negative_ttl('not_found')
+                if ttl:
+                    store.put_negative(site, item_id, 'not_found', e.orig_msg, ttl)
+            raise
+        ttl = self._negative_ttl('no_video')
+        if ttl and self._is_complete() and is_no_video(info):
+            store.put_negative(site, item_id, 'no_video', info, ttl)
+        return info
+
+    def _rate_limiter(self):
+        rate = float_or_none(plugin_arg(self, 'rate_limit'))
+        if rate == 0:
+            return None
+        return HostRateLimiter.shared(rate, float_or_none(plugin_arg(self, 'rate_burst')))
+
+    def _request_webpage(self, url_or_request, *args, **kwargs):
+        limiter = self._rate_limiter()
+        if limiter is not None:
+            url = url_or_request.url if isinstance(url_or_request, Request) else url_or_request
+            bucket = urllib.parse.urlparse(url).hostname
+            account = current_account.get()
+            if account is not None:
+                bucket = f'{bucket} ({account.name})'
+            with self._span('ratelimit'):
+                limiter.acquire(bucket)
+        try:
+            with self._span('download'):
+                urlh = super()._request_webpage(url_or_request, *args, **kwargs)
+        except ExtractorError as e:
+            if limiter is not None and isinstance(e.cause, HTTPError) and (
+                    e.cause.status == 429 or e.cause.status >= 500):
+                limiter.feedback(bucket, throttled=True)
+            raise
+        if urlh:
+            self._count_response(urlh)
+            if limiter is not None:
+                limiter.feedback(bucket, throttled=bool(
+                    urlh.status == 429 or urlh.status >= 500 or _PUSHBACK_URL_RE.search(urlh.url)))
+        return urlh
+
+    def _count_response(self, urlh):
+        """Count a response, and the bytes of its body as they are read, in the running extraction"""
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return
+        metrics.count('requests')
+        read = urlh.read
+
+        def counting_read(*args, **kwargs):
+            data = read(*args, **kwargs)
+            metrics.count('bytes', len(data))
+            return data
+        urlh.read = counting_read
+
+    def _webpage_read_content(self, *args, **kwargs):
+        with self._span('download'):
+            return super()._webpage_read_content(*args, **kwargs)
+
+    def _search_regex(self, *args, **kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super()._search_regex(*args, **kwargs)
+        with metrics.span('regex'):
+            return super()._search_regex(*args, **kwargs)
+
+    def _scan_fields(self, scanner, webpage, defaults=None, fatal=True):
+        """Search all fields of a FieldScanner in one pass
+
+        Each field gets the value _search_regex would return for its pattern;
+        a missing field takes its value from defaults or, if it has none, is
+        an error when fatal and None with a warning otherwise.
+        """
+        with self._span('regex'):
+            found = scanner.scan(webpage)
+        defaults = defaults or {}
+        for name in scanner.patterns:
+            if name in found:
+                continue
+            if name in defaults:
+                found[name] = defaults[name]
+            elif fatal:
+                raise RegexNotFoundError(f'Unable to extract {name}')
+            else:
+                self.report_warning(f'unable to extract {name}')
+                found[name] = None
+        return found
+
+    def _locate_json(self, anchor, webpage, name, default=NO_DEFAULT, fatal=True):
+        """JSON value following the anchor regex (see locate_json), with the
+        default/fatal handling of _search_regex"""
+        with self._span('json'):
+            value = locate_json(webpage, anchor)
+        if value is not None:
+            return value
+        if default is not NO_DEFAULT:
+            return default
+        if fatal:
+            raise RegexNotFoundError(f'Unable to extract {name}')
+        self.report_warning(f'unable to extract {name}')
+        return None
+
+    def _parse_json(self, *args, **kwargs):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super()._parse_json(*args, **kwargs)
+        with metrics.span('json'):
+            return super()._parse_json(*args, **kwargs)
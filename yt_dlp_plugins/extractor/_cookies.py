@@ -0,0 +1,105 @@
+# coding: utf-8
+import contextvars
+import glob
+import os
+import threading
+import time
+
+from yt_dlp.cookies import YoutubeDLCookieJar
+
+# Pool account whose cookies the requests of the running extraction are sent with
+current_account = contextvars.ContextVar('yt_dlp_taobao_account', default=None)
+
+
+class _Account:
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.jar = None
+        self.mtime = None
+        self.score = 1.0
+        self.strikes = 0
+        self.quarantined_until = 0
+        self.in_use = 0
+        self.last_used = 0
+        self.load()
+
+    def load(self):
+        jar = YoutubeDLCookieJar(self.path)
+        jar.load()
+        self.jar, self.mtime = jar, os.stat(self.path).st_mtime
+
+    def changed(self):
+        try:
+            return os.stat(self.path).st_mtime != self.mtime
+        except OSError:
+            return False
+
+
+class CookiePool:
+    """Cookie files of several accounts, handed out by health
+
+    Every *.txt Netscape cookie file of the directory is one account. Each
+    extraction gets the least busy healthy account. An account sent to the
+    login page is quarantined, for quarantine seconds doubling with every
+    strike in a row, and its cookie file is read again once it has changed.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory, quarantine=300):
+        self.directory = directory
+        self.quarantine_seconds = quarantine
+        self._lock = threading.Lock()
+        self._accounts = [_Account(path) for path in sorted(glob.glob(os.path.join(directory, '*.txt')))]
+
+    @classmethod
+    def open(cls, directory, quarantine=300):
+        """Return the pool of directory, shared by every extractor of the process"""
+        with cls._instances_lock:
+            if directory not in cls._instances:
+                cls._instances[directory] = cls(directory, quarantine)
+            pool = cls._instances[directory]
+            pool.quarantine_seconds = quarantine
+            return pool
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def acquire(self, exclude=()):
+        """Take the best available account, or None if every one is quarantined or excluded"""
+        now = time.time()
+        with self._lock:
+            available = [
+                account for account in self._accounts
+                if account not in exclude and account.quarantined_until <= now]
+            if not available:
+                return None
+            account = min(available, key=lambda a: (a.in_use, -a.score, a.last_used))
+            if account.strikes and account.changed():
+                account.load()
+            account.in_use += 1
+            account.last_used = now
+            return account
+
+    def release(self, account, ok=None):
+        """Return an account; ok=True marks a successful extraction, ok=False a login redirect"""
+        with self._lock:
+            account.in_use -= 1
+            if ok:
+                account.score = min(1.0, account.score + 0.25)
+                account.strikes = 0
+            elif ok is False:
+                account.score /= 2
+                account.strikes += 1
+                account.quarantined_until = time.time() + self.quarantine_seconds * 2 ** (account.strikes - 1)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            return [{
+                'account': account.name,
+                'score': round(account.score, 3),
+                'in_use': account.in_use,
+                'quarantined_for': max(0, round(account.quarantined_until - now)),
+            } for account in self._accounts]
@@ -0,0 +1,147 @@
+# coding: utf-8
+import json
+import re
+
+from yt_dlp.utils import (
+    # int_or_none,
+    # js_to_json,
+    # mimetype2ext,
+    float_or_none,
+    int_or_none,
+    remove_end,
+    traverse_obj,
+    url_or_none,
+)
+
+from yt_dlp.extractor.ebay import EbayIE
+
+from ._common import NO_VIDEO_URL, LoginRedirectError, PluginBaseIE
+from ._utils import plugin_arg
+
+
+class EbayIE_Thumb(EbayIE, PluginBaseIE, plugin_name='ebay_img'):
+    """Listing of eBay: the picture gallery and the video
+
+    Both come from the mediaList of the PICTURE model, decoded once; pages
+    without that model fall back to the first "video" object. Every picture
+    is returned in the sizes of _GALLERY_SIZES. The HLS and DASH manifests
+    are fetched side by side, or not at all with images_only. With
+    manifest_ttl=SECONDS, their formats are kept in the product cache by
+    manifest URL for that long.
+    """
+    IE_NAME = 'ebay:product'
+    _ITEM_IDS_PER_HOST = True
+    _VALID_URL = r'https?://(?:www\.)?ebay\.(?:[a-z]{2,3})(?:\.[a-z]{2})?/(?:itm)(?:[/\S])*/(?P<id>[0-9]{9,12})'
+    _TESTS = [{
+        'url': 'https://www.ebay.com/itm/adidas-Originals-Ultraboost-DNA-XXII-Shoes-Men-039-s-/155249878436?&_trksid=p2056016.m2516.l5255',
+        'info_dict': {
+            'id': '155249878436',
+            'ext': 'mp4',
+            'title': 'Video title goes here',
+            'thumbnail': r're:^https?://.*\.jpg$',
+            # TODO more properties, either as:
+            # * A value
+            # * MD5 checksum; start the string with md5:
+            # * A regular expression; start the string with re:
+            # * Any Python type (for example int or float)
+        }
+    }]
+    # Longest side of the renditions of ".../s-l500.jpg" offered per picture
+    _GALLERY_SIZES = (500, 1600, 2000)
+
+    def _gallery_thumbnails(self, media_list):
+        thumbnails = {}
+        for media in media_list:
+            image = traverse_obj(media, ('image', 'originalImg'))
+            url = url_or_none(traverse_obj(image, 'URL'))
+            if not url:
+                continue
+            if not re.search(r's-l\d+\.\w+$', url):
+                thumbnails.setdefault(url, {'url': url})
+                continue
+            # Without the original's dimensions the hint is the bounding box
+            width = int_or_none(traverse_obj(image, 'maxImageWidth', 'width'))
+            height = int_or_none(traverse_obj(image, 'maxImageHeight', 'height'))
+            for size in self._GALLERY_SIZES:
+                sized = re.sub(r's-l\d+(?=\.\w+$)', f's-l{size}', url)
+                scale = min(1, size / max(width, height)) if width and height else None
+                thumbnails.setdefault(sized, {
+                    'url': sized,
+                    'width': round(width * scale) if scale else size,
+                    'height': round(height * scale) if scale else size,
+                })
+        return list(thumbnails.values())
+
+    def _manifest_formats(self, key, url, video_id):
+        ttl = float_or_none(plugin_arg(self, 'manifest_ttl'))
+        cache = ttl and self._product_store()
+        site = f'{self.ie_key()}:{key}'
+        if cache:
+            cached = cache.get(site, url)
+            if cached:
+                self.write_debug(f'{video_id}: Using cached {key} manifest')
+                return cached['formats']
+        if key == 'HLS':
+            formats = self._extract_m3u8_formats(url, video_id, fatal=False)
+        else:
+            formats = self._extract_mpd_formats(url, video_id, fatal=False)
+        if cache and formats:
+            cache.put(site, url, {'formats': formats}, ttl)
+        return formats
+
+    def _real_extract(self, eurl):
+        video_id = self._match_id(eurl)
+        webpage, urlh = self._download_webpage_handle(eurl, video_id)
+        visitor_url = urlh.url
+        if 'login.jhtml' in visitor_url:
+            raise LoginRedirectError()
+        model = self._locate_json(r'\[\["PICTURE0-0",0,\{"model":', webpage, 'picture model', default=None)
+        if model:
+            media_list = model.get('mediaList') or []
+            thumb = self._gallery_thumbnails(media_list)
+            video_json = traverse_obj(media_list, (..., 'video'), get_all=False) or {}
+        else:
+            thumb = []
+            video_json = self._search_json(r'"video":', webpage, 'video json', video_id)
+        formats = []
+        manifests = []
+        for key, url in (video_json.get('playlistMap') or {}).items():
+            if key in ('HLS', 'DASH') and self._images_only():
+                formats.append(self._manifest_stub_format(url, key))
+            elif key in ('HLS', 'DASH'):
+                manifests.append(self._submit_background(self._manifest_formats, key, url, video_id))
+            else:
+                self.report_warning(f'Unsupported format {key}', video_id)
+        for manifest in manifests:
+            formats.extend(manifest.result())
+        if not formats and thumb:
+            formats.append({
+                'url': NO_VIDEO_URL,
+                'ext': 'mp4',
+                'format_id': 'http-mp4',
+            })
+
+        # if not pid:
+        #     raise ExtractorError(
+        #         'Không thể lấy video/ảnh, vui lòng kiểm tra lại liên kết hoặc liên hệ hỗ trợ',
+        #         expected=True)
+        # title = self._search_regex(r'<title>([^<]+)<', webpage, 'title')
+        if video_id is None:
+            return {
+                # I have no idea what these params mean but it at least seems to work
+                # 'url': "http://bo.vutn.net/no-video.mp4",
+                # 'id': pid,
+                # 'title': title,
+                # 'thumbnails': thumb,
+                'id': video_id,
+                'title': remove_end(self._html_extract_title(webpage), ' | eBay'),
+                'thumbnails': thumb,
+                'formats': formats
+            }
+        else:
+            return {
+            'id': video_id,
+            'title': remove_end(self._html_extract_title(webpage), ' | eBay'),
+            'thumbnails': thumb,
+            'formats': formats
+            }
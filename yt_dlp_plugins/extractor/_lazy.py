@@ -0,0 +1,95 @@
+# coding: utf-8
+import importlib
+import importlib.abc
+import sys
+import traceback
+
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.utils import write_string
+
+# The public plugin modules hold only what yt-dlp needs to match URLs; the
+# extractors themselves live in the underscored modules, which yt-dlp's plugin
+# loader skips, and are imported the first time one of them is used.
+
+
+class LazyExtractor(InfoExtractor):
+    """Index entry standing in for the extractor of the same name in _module
+
+    Subclasses repeat only IE_NAME and _VALID_URL of the real extractor.
+    Instantiating one imports _module and returns the real extractor.
+    """
+    _module = None
+
+    @classmethod
+    def real_class(cls):
+        if '_real_class' not in cls.__dict__:
+            real = getattr(importlib.import_module(cls._module), cls.__name__)
+            if (real.IE_NAME, real._VALID_URL) != (cls.IE_NAME, cls._VALID_URL):
+                write_string(f'WARNING: Lazy index entry of {cls.__name__} is out of date with {cls._module}\n')
+            cls._real_class = real
+        return cls._real_class
+
+    def __new__(cls, *args, **kwargs):
+        real = cls.real_class()
+        instance = real.__new__(real)
+        instance.__init__(*args, **kwargs)
+        return instance
+
+
+class _PostImportLoader(importlib.abc.Loader):
+    def __init__(self, loader, callback):
+        self._loader = loader
+        self._callback = callback
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        self._callback()
+
+
+class _PostImportFinder(importlib.abc.MetaPathFinder):
+    def __init__(self):
+        self._callbacks = {}
+
+    def add(self, fullname, callback):
+        self._callbacks[fullname] = callback
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in self._callbacks:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec and spec.loader:
+                spec.loader = _PostImportLoader(spec.loader, self._callbacks.pop(fullname))
+                return spec
+        return None
+
+
+_finder = _PostImportFinder()
+sys.meta_path.insert(0, _finder)
+
+
+def override_on_import(module, plugin_module):
+    """Import plugin_module, which overrides an extractor of the yt-dlp module
+    named module, only once that module is itself imported
+
+    With yt-dlp's lazy extractors the module is imported on the first URL it
+    matches, and the override is then in place before its extractor is used.
+    """
+    def load():
+        try:
+            importlib.import_module(plugin_module)
+        except Exception:
+            write_string(f'Error while importing module {plugin_module!r}\n{traceback.format_exc(limit=-1)}')
+
+    if module in sys.modules:
+        load()
+    else:
+        _finder.add(module, load)
@@ -0,0 +1,90 @@
+# coding: utf-8
+import threading
+import time
+
+
+class _Bucket:
+    __slots__ = ('rate', 'tokens', 'updated', 'requests', 'throttled')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.requests = 0
+        self.throttled = 0
+
+
+class HostRateLimiter:
+    """Token bucket per host whose rate adapts to the site's pushback
+
+    Each host starts at `rate` requests per second with bursts of up to
+    `burst`. Buckets are named by the caller, so one host may have several
+    (one per account, say). A throttled response (login or captcha redirect, HTTP 429/5xx)
+    halves the rate of its host, down to min_rate, and empties its bucket;
+    every successful one raises it back by a tenth of `rate`.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate=2.0, burst=5, min_rate=0.1):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, rate=None, burst=None):
+        """Return the limiter shared by every extractor of the process, updating its settings"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            limiter = cls._shared
+            if rate:
+                limiter.rate = rate
+            if burst:
+                limiter.burst = burst
+            return limiter
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.rate, self.burst)
+        return bucket
+
+    def acquire(self, host):
+        """Wait for a token of host; return the seconds waited"""
+        waited = 0
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.requests += 1
+                    return waited
+                wait = (1 - bucket.tokens) / bucket.rate
+            time.sleep(wait)
+            waited += wait
+
+    def feedback(self, host, throttled):
+        with self._lock:
+            bucket = self._bucket(host)
+            if throttled:
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                bucket.tokens = min(bucket.tokens, 0)
+                bucket.throttled += 1
+            else:
+                bucket.rate = min(self.rate, bucket.rate + self.rate / 10)
+
+    def stats(self):
+        with self._lock:
+            return {host: {
+                'rate': round(bucket.rate, 3),
+                'max_rate': self.rate,
+                'tokens': round(bucket.tokens, 2),
+                'requests': bucket.requests,
+                'throttled': bucket.throttled,
+            } for host, bucket in self._buckets.items()}
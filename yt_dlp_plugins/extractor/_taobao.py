@@ -0,0 +1,433 @@
+# coding: utf-8
+import codecs
+import http.client
+import json
+import os
+import re
+from yt_dlp.networking.exceptions import TransportError
+from yt_dlp.utils import (
+    # int_or_none,
+    # js_to_json,
+    # mimetype2ext,
+    ExtractorError,
+    float_or_none,
+)
+
+from ._cookies import CookiePool, current_account
+from ._common import (
+    _PUSHBACK_URL_RE,
+    NO_VIDEO_URL,
+    UNAVAILABLE_MSG,
+    ItemNotFoundError,
+    LoginRedirectError,
+    PluginBaseIE,
+    is_no_video,
+)
+from ._utils import FieldScanner, plugin_arg, unique_thumbnails
+
+# Fields of the Tmall and Taobao item pages, all found near the top of the HTML
+_TMALL_FIELDS = FieldScanner({
+    'video id': r'"imgVedioID"\s*:\s*"?(\d+)"?',
+    'video uid': r'"userId"\s*:\s*"?(?P<uid>\d+)"?',
+    'title': r'<title>([^<]+)<',
+})
+_TAOBAO_FIELDS = FieldScanner({
+    'video id': r'"videoId"\s*:\s*"?(\d+)"?',
+    'video uid': r'"videoOwnerId"\s*:\s*"?(?P<uid>\d+)"?',
+    'title': r'<title>([^<]+)<',
+})
+# Marks the end of the streamed read only; the blob is decoded with _locate_json
+_TSHOP_SETUP_RE = r'TShop\.Setup\(\s*\{.*?\}\s*\);'
+
+
+class _AlibabaBaseIE(PluginBaseIE):
+    """Serves repeated product links from the on-disk product cache
+
+    The cache is enabled with --extractor-args "yt_dlp_taobao:cache_ttl=SECONDS"
+    and bounded by cache_max_mb (default 64); cache_bypass forces a fresh
+    extraction that then refreshes the cached entry. Listings without video
+    are never stored here; no_video_ttl keeps them in the negative cache
+    instead (see PluginBaseIE).
+
+    With cookie_pool=DIR every extraction runs with the cookies of one of the
+    accounts in DIR (see CookiePool); one sent to the login page is
+    quarantined for cookie_quarantine seconds (default 300) and the
+    extraction retried with the next healthy account.
+    """
+
+    def _product_cache(self):
+        ttl = float_or_none(plugin_arg(self, 'cache_ttl'))
+        cache = ttl and self._product_store()
+        return (cache, ttl) if cache else (None, None)
+
+    def _real_extract(self, gurl):
+        pid = self._match_id(gurl)
+        cache, ttl = self._product_cache()
+        if cache and plugin_arg(self, 'cache_bypass') is None:
+            info = cache.get(self.ie_key(), pid)
+            if info:
+                self.to_screen(f'{pid}: Using cached product info')
+                return info
+        pool = self._cookie_pool()
+        if pool:
+            info = self._with_negative_cache(gurl, pid, self._extract_with_cookie_pool, pool, gurl, pid)
+        else:
+            info = self._with_negative_cache(gurl, pid, self._extract_product, gurl, pid)
+        if cache and self._is_complete() and not is_no_video(info):
+            cache.put(self.ie_key(), pid, info, ttl)
+        return info
+
+    def _cookie_pool(self):
+        directory = plugin_arg(self, 'cookie_pool', casesense=True)
+        if not directory:
+            return None
+        quarantine = float_or_none(plugin_arg(self, 'cookie_quarantine')) or 300
+        pool = CookiePool.open(os.path.abspath(os.path.expanduser(directory)), quarantine)
+        if not len(pool):
+            raise ExtractorError(f'No cookie files (*.txt) in {directory}', expected=True)
+        return pool
+
+    def _extract_with_cookie_pool(self, pool, gurl, pid):
+        tried = []
+        while True:
+            account = pool.acquire(exclude=tried)
+            if account is None:
+                raise LoginRedirectError()
+            self.write_debug(f'{pid}: Using the cookies of {account.name}')
+            token = current_account.set(account)
+            try:
+                info = self._extract_product(gurl, pid)
+            except LoginRedirectError:
+                pool.release(account, ok=False)
+                self.report_warning(f'{pid}: {account.name} was sent to the login page; trying another account')
+                tried.append(account)
+                continue
+            except BaseException:
+                pool.release(account)
+                raise
+            finally:
+                current_account.reset(token)
+            pool.release(account, ok=True)
+            return info
+
+    def _create_request(self, *args, **kwargs):
+        request = super()._create_request(*args, **kwargs)
+        account = current_account.get()
+        if account is not None:
+            request.extensions.setdefault('cookiejar', account.jar)
+        return request
+
+    def _download_webpage_until(self, url, video_id, required, chunk_size=64 * 1024):
+        """Download a webpage only until every pattern of required(final url) has matched
+
+        Only whole lines are searched, so whatever a pattern matches in the
+        partial page is what it would match in the full one. The connection is
+        closed as soon as all of them have matched; if any is missing the whole
+        page is read. Read errors and blocked pages are reported as by
+        _download_webpage_handle. The full_page extractor-arg (or --write-pages)
+        disables this. Returns (webpage, urlh) like _download_webpage_handle.
+        """
+        if (plugin_arg(self, 'full_page') is not None
+                or self.get_param('write_pages') or self.get_param('dump_intermediate_pages')):
+            return self._download_webpage_handle(url, video_id)
+        urlh = self._request_webpage(url, video_id)
+        pending = [re.compile(pattern) for pattern in required(urlh.url)]
+        stop_early = bool(pending)
+        decoder, webpage, searched, received = None, '', 0, 0
+        with self._span('download'):
+            try:
+                while pending or not stop_early:
+                    try:
+                        chunk = urlh.read(chunk_size)
+                    except (TransportError, http.client.IncompleteRead) as err:
+                        raise ExtractorError(
+                            f'{video_id}: Error reading response: {getattr(err, "msg", err)}', cause=err)
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                    if decoder is None:
+                        encoding = self._guess_encoding_from_content(urlh.headers.get('Content-Type', ''), chunk)
+                        try:
+                            decoder = codecs.getincrementaldecoder(encoding)('replace')
+                        except LookupError:
+                            decoder = codecs.getincrementaldecoder('utf-8')('replace')
+                    webpage += decoder.decode(chunk)
+                    complete = webpage.rfind('\n') + 1
+                    pending = [p for p in pending if not p.search(webpage, searched, complete)]
+                    searched = complete
+                else:
+                    self.write_debug(f'{video_id}: All fields found after {received} bytes; not reading further')
+            finally:
+                urlh.close()
+            if decoder:
+                webpage += decoder.decode(b'', final=True)
+        # Upstream's check of a fully read page; the blocking notices are in the first lines
+        self._InfoExtractor__check_blocked(webpage)
+        return webpage, urlh
+
+    def _extract_product(self, gurl, pid):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+
+class TmallIE(_AlibabaBaseIE):
+    IE_NAME = 'tmall:product'
+    _VALID_URL = r'https?:\/\/(?:(?:www|[a-z]{2})\.)?detail\.tmall\.com\/.*?id\=(?P<id>\d+)'
+
+    _TESTS = [{
+        'url': 'https://detail.tmall.com/item.htm?id=656308694954',
+        'info_dict': {
+            'id': '656308694954',
+            'ext': 'mp4',
+            'title': 'Video title goes here',
+            'thumbnail': r're:^https?://.*\.jpg$',
+            # TODO more properties, either as:
+            # * A value
+            # * MD5 checksum; start the string with md5:
+            # * A regular expression; start the string with re:
+            # * Any Python type (for example int or float)
+        }
+    }]
+
+    def _page_fields(self, url):
+        if 'detail.tmall.com' in url:
+            return _TMALL_FIELDS.patterns.values()
+        if 'item.taobao.com' in url:
+            return _TAOBAO_FIELDS.patterns.values()
+        return ()
+
+    def _extract_product(self, gurl, pid):
+        webpage, urlh = self._download_webpage_until(gurl, pid, self._page_fields)
+        visitor_url = urlh.url
+        if 'detail.tmall.com' in visitor_url:
+            fields = self._scan_fields(_TMALL_FIELDS, webpage)
+        elif 'item.taobao.com' in visitor_url:
+            fields = self._scan_fields(_TAOBAO_FIELDS, webpage)
+        vid, uid, title = fields['video id'], fields['video uid'], fields['title']
+        return {
+            # I have no idea what these params mean but it at least seems to work
+            'url': 'https://cloud.video.taobao.com/play/u/%s/p/1/e/6/t/1/%s.mp4' % (uid, vid),
+            'id': vid,
+            'title': title,
+        }
+
+
+class TaobaoIE(_AlibabaBaseIE):
+    IE_NAME = 'taobao:product'
+    _VALID_URL = r'https?:\/\/(?:(?:www|[a-z]{2})\.)?item\.taobao\.com\/.*?id\=(?P<id>\d+)'
+
+    _LOGIN_URL = 'https://login.taobao.com/member/login.jhtml'
+    _TESTS = [{
+        'url': 'https://item.taobao.com/item.htm?id=656308694954',
+        'info_dict': {
+            'id': '656308694954',
+            'ext': 'mp4',
+            'title': 'Video title goes here',
+            'thumbnail': r're:^https?://.*\.jpg$',
+            # TODO more properties, either as:
+            # * A value
+            # * MD5 checksum; start the string with md5:
+            # * A regular expression; start the string with re:
+            # * Any Python type (for example int or float)
+        }
+    }]
+
+    def _page_fields(self, url):
+        if 'detail.tmall.com' in url:
+            return (*_TMALL_FIELDS.patterns.values(), _TSHOP_SETUP_RE)
+        if 'item.taobao.com' in url:
+            return _TAOBAO_FIELDS.patterns.values()
+        return ()
+
+    def _extract_product(self, gurl, pid):
+        webpage, urlh = self._download_webpage_until(gurl, pid, self._page_fields)
+        visitor_url = urlh.url
+        thumb = []
+        if 'login.jhtml' in visitor_url:
+            raise LoginRedirectError()
+        if 'detail.tmall.com' in visitor_url:
+            fields = self._scan_fields(_TMALL_FIELDS, webpage)
+            y = self._locate_json(r'TShop\.Setup\(', webpage, 'shop setup')
+            imgsku = y["propertyPics"]
+            gallery, sku = [], []
+            for key, value in imgsku.items():
+                if key in "default":
+                    gallery.extend(value)
+                else:
+                    sku.append(value[0])
+            with self._span('dedupe'):
+                thumb = unique_thumbnails(('gallery', gallery), ('sku', sku))
+        elif 'item.taobao.com' in visitor_url:
+            fields = self._scan_fields(_TAOBAO_FIELDS, webpage)
+        vid, uid, title = fields['video id'], fields['video uid'], fields['title']
+        return {
+            # I have no idea what these params mean but it at least seems to work
+            'url': 'https://cloud.video.taobao.com/play/u/%s/p/1/e/6/t/1/%s.mp4' % (uid, vid),
+            'id': vid,
+            'title': title,
+            'thumbnails': thumb,
+        }
+
+
+class TaobaoWorldIE(_AlibabaBaseIE):
+    IE_NAME = 'taobaoworld:product'
+    _VALID_URL = r'https?:\/\/(?:(?:www|[a-z]{2})\.)?world\.taobao\.com\/item\/(?P<id>\d+)\.htm'
+
+    _LOGIN_URL = 'https://login.taobao.com/member/login.jhtml'
+    _PAGE_FIELDS = FieldScanner({
+        'video url': r'"videoUrl"\s*:\s*"?(\S+)"}',
+        'user id': r'"userId"\s*:\s*"?(?P<uid>\d+)"?',
+        'imglist': r'"images"\s*:\s*(?P<urlthumb>"?\S+\"\])',
+        'title': r'<title>([^<]+)<',
+    })
+    _TESTS = [{
+        'url': 'https://world.taobao.com/item/643681750378.htm',
+        'info_dict': {
+            'id': '643681750378',
+            'ext': 'mp4',
+            'title': 'Video title goes here',
+            'thumbnail': r're:^https?://.*\.jpg$',
+            # TODO more properties, either as:
+            # * A value
+            # * MD5 checksum; start the string with md5:
+            # * A regular expression; start the string with re:
+            # * Any Python type (for example int or float)
+        }
+    }]
+
+    def _extract_product(self, gurl, pid):
+        webpage, urlh = self._download_webpage_handle(gurl, pid)
+        visitor_url = urlh.url
+        if 'login.jhtml' in visitor_url:
+            raise LoginRedirectError()
+        fields = self._scan_fields(self._PAGE_FIELDS, webpage, defaults={
+            'video url': None, 'user id': None, 'imglist': None})
+        videoURL = fields['video url']
+        if not videoURL:
+            videoURL = NO_VIDEO_URL
+        uid = fields['user id']
+        if not uid:
+            if self.suitable(visitor_url) or _PUSHBACK_URL_RE.search(visitor_url):
+                # Still on the item page, or on a captcha: nothing says the listing is gone
+                raise ExtractorError(UNAVAILABLE_MSG, expected=True)
+            # Sent away from the item to some other page of the site
+            raise ItemNotFoundError()
+        title = fields['title']
+        with self._span('json'):
+            listthumb = json.loads(fields['imglist'])
+        y = self._locate_json(r'window\.__INITIAL_DATA__\s*=', webpage, 'shop JS', default=None)
+        price = y["pageInitialProps"]["httpData"]["normalItemResponse"]["itemPrice"]["promotionPrice"]
+        fulltitle = f"{title} - Giá bán: {price} tệ"
+        htmldesc = y["pageInitialProps"]["httpData"]["normalItemResponse"]["itemDesc"]
+        imgdesc = re.findall(r'((img|cbu01)\.alicdn\.com.*?\.(jpg|png))', htmldesc)
+        probimglst = []
+        probimg = str(y["pageInitialProps"]["httpData"]["normalItemResponse"]["itemSkuDO"]["skuPropertyList"])
+        if probimg is not None:
+            probimglst = re.findall(r'((img|cbu01)\.alicdn\.com.*?\.(jpg|png))', probimg)
+        # pageInitialProps►httpData►normalItemResponse►itemSkuDO►skuPropertyList►1►propertyValues►
+        with self._span('dedupe'):
+            new_finalthumb = unique_thumbnails(
+                ('gallery', listthumb),
+                ('description', [image[0] for image in imgdesc]),
+                ('sku', [image[0] for image in probimglst]))
+        return {
+            # I have no idea what these params mean but it at least seems to work
+            'url': videoURL,
+            'id': uid,
+            'title': fulltitle,
+            'thumbnails': new_finalthumb,
+        }
+
+
+class Ali1688IE(_AlibabaBaseIE):
+    IE_NAME = 'ali1688:product'
+    _VALID_URL = r'https?:\/\/(?:(?:www|[a-z]{2})\.)?(?:detail|m)\.1688\.com\/offer\/(?P<id>\d+)\.html'
+
+    _LOGIN_URL = 'https://login.taobao.com/member/login.jhtml'
+    _PAGE_FIELDS = FieldScanner({
+        'video id': r'"videoId":(?P<uid>\d+)',
+        'video url': r'"videoUrl":"(?P<videoUrl>.+?)"',
+        'title': r'<title>([^<]+)<',
+    })
+    _TESTS = [{
+        'url': 'https://m.1688.com/offer/594689528709.html',
+        'info_dict': {
+            'id': '594689528709',
+            'ext': 'mp4',
+            'title': 'Video title goes here',
+            'thumbnail': r're:^https?://.*\.jpg$',
+            # TODO more properties, either as:
+            # * A value
+            # * MD5 checksum; start the string with md5:
+            # * A regular expression; start the string with re:
+            # * Any Python type (for example int or float)
+        }
+    }]
+
+    def _extract_product(self, gurl, pid):
+        webpage, urlh = self._download_webpage_handle(gurl, pid)
+        # visitor_url = urlh.geturl()
+        # debug print('visitor url %s' % visitor_url)
+        fields = self._scan_fields(self._PAGE_FIELDS, webpage, defaults={'video url': None})
+        uid = fields['video id']
+        videoURL = ''
+        # debug print('uid is %s' % uid)
+        if uid == '0':
+            videoURL = NO_VIDEO_URL
+        else:
+            videoURL = fields['video url']
+        y = self._locate_json(r'window\.__INIT_DATA\s*=', webpage, 'shop JS', default=None)
+        # urlthumb = y["data"]["5908930030501"]["data"]["offerImgList"]
+        urlthumb = []
+        detailurl = []
+        for key, value in y["data"].items():
+            if 'componentType' not in value:
+                continue
+            if value.get('data', {}).get('offerImgList'):
+                urlthumb = value['data']['offerImgList']
+            if value.get('data', {}).get('detailUrl'):
+                detailurl = value['data']['detailUrl']
+        detail_page = None
+        if detailurl and self._is_complete():
+            # Fetched in the background while the offer page is parsed
+            detail_page = self._submit_background(
+                self._download_webpage, detailurl, pid, 'Downloading description page')
+        # print('offerImgList', offerImgList)
+        # urlthumb = self._search_regex(
+        #    r'"offerImgList"\s*:\s*(?P<urlthumb>\["?\S+\"\])',
+        #    webpage, 'imglist')
+        # print(urlthumb)
+        # print(detailurl)
+        # listthumb = json.loads(urlthumb)
+        title = fields['title']
+        imgproblst = []
+        if "skuProps" in y["globalData"]["skuModel"]:
+            imgprob = str(y["globalData"]["skuModel"]["skuProps"])
+            imgproblst = re.findall(r'((img|cbu01)\.alicdn\.com.*?\.(jpg|png))', imgprob)
+            # print("sku")
+            # print(imgproblst)
+        # detailurl = (str(y["data"]["590893002100"]["data"]["detailUrl"]))
+        # print(detailurl)
+        detailimglst = []
+        if detail_page is not None:
+            # print(detailurl)
+            webpage2 = detail_page.result()
+            detailimglst = re.findall(r'((cbu01|img)\.alicdn\.com\/img.*?\.(jpg|png))', webpage2)
+            # print(detailimglst)
+        with self._span('dedupe'):
+            new_finalthumb = unique_thumbnails(
+                ('gallery', urlthumb),
+                ('sku', [image[0] for image in imgproblst]),
+                ('description', [image[0] for image in detailimglst]))
+        # print(new_finalthumb)
+        # thumb = [w.replace('(?:[-_]?[0-9]+x[0-9]+)+', '') for w in thumb]
+        return {
+            # I have no idea what these params mean but it at least seems to work
+            'url': videoURL,
+            'id': uid,
+            'title': title,
+            'thumbnails': new_finalthumb,
+        }
+
+    def _is_complete(self):
+        # skip_detail: leave out the description images, saving a round trip
+        return super()._is_complete() and plugin_arg(self, 'skip_detail') is None
@@ -0,0 +1,174 @@
+# coding: utf-8
+import json
+import re
+import urllib.parse
+
+
+class ScriptIndex:
+    """Single-pass index of the <script> blocks of a webpage
+
+    The page is tokenized once; every block is recorded by offset and filed
+    under each of the given markers it contains, so that later lookups only
+    touch the few blocks that can possibly match. Decoded blocks are
+    memoized by offset, so no block is parsed twice.
+    """
+    _SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script>', re.DOTALL)
+
+    def __init__(self, webpage, markers=()):
+        self.blocks = {}
+        self._by_marker = {marker: [] for marker in markers}
+        self._decoded = {}
+        for mobj in self._SCRIPT_RE.finditer(webpage):
+            offset, content = mobj.start(2), mobj.group(2)
+            self.blocks[offset] = (mobj.group(1), content)
+            for marker, offsets in self._by_marker.items():
+                if marker in content:
+                    offsets.append(offset)
+
+    def find(self, marker, data_sjs=False):
+        """Yield (offset, content) of the blocks carrying marker, in page order"""
+        for offset in self._by_marker[marker]:
+            attrs, content = self.blocks[offset]
+            if data_sjs and not (attrs.rstrip().endswith('data-sjs') and content.startswith('{')):
+                continue
+            yield offset, content
+
+    def decode(self, offset, transform):
+        """Return transform(content) of the block at offset, computed only once"""
+        if offset not in self._decoded:
+            self._decoded[offset] = transform(self.blocks[offset][1])
+        return self._decoded[offset]
+
+    def search(self, patterns, marker, data_sjs=False, group=1, default=None):
+        """Search the blocks carrying marker; return the first match of any pattern"""
+        if isinstance(patterns, str):
+            patterns = (patterns, )
+        for pattern in patterns:
+            for _, content in self.find(marker, data_sjs):
+                mobj = re.search(pattern, content)
+                if mobj:
+                    return mobj.group(group)
+        return default
+
+
+class FieldScanner:
+    """Named field patterns of a page, compiled once per extractor class
+
+        FIELDS = FieldScanner({'video id': r'"videoId":(\\d+)', 'title': r'<title>([^<]+)<'})
+        FIELDS.scan(webpage)  # {'video id': '123', 'title': '...'}
+
+    A field gets the value _search_regex would return for its pattern: the
+    first non-empty group of the first match. Fields that do not match are
+    left out. Each pattern is searched on its own; these all start with a
+    literal, and re's literal-prefix search over the page is several times
+    faster than any single pass over a combined alternation of them.
+    """
+
+    def __init__(self, fields):
+        self.patterns = dict(fields)
+        self._regexes = {name: re.compile(pattern) for name, pattern in self.patterns.items()}
+
+    def scan(self, webpage):
+        found = {}
+        for name, regex in self._regexes.items():
+            mobj = regex.search(webpage)
+            if mobj:
+                found[name] = next((g for g in mobj.groups() if g is not None), mobj.group())
+        return found
+
+
+_JSON_OPEN_RE = re.compile(r'\s*(?=[{\[])')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def locate_json(webpage, anchor):
+    """Decode the JSON object or array right after the anchor regex
+
+    The value ends at the bracket that balances its first one, found by the
+    json module's scanner, which steps over string literals and escapes in
+    the same single pass that decodes them. Anything following the value on
+    the same line is never looked at. Returns None if the anchor is missing
+    or not followed by valid JSON.
+    """
+    mobj = re.search(anchor, webpage)
+    begin = mobj and _JSON_OPEN_RE.match(webpage, mobj.end())
+    if not begin:
+        return None
+    try:
+        return _JSON_DECODER.raw_decode(webpage, begin.end())[0]
+    except ValueError:
+        return None
+
+
+_ALICDN_SCHEME_RE = re.compile(r'^(?:(?:https?:)?//)?')
+_ALICDN_RESIZE_RE = re.compile(r'\.(?:[-_]?\d{2,4}x\d{2,4})+\.|\.summ\.|\.search\.')
+_ALICDN_DERIVED_RE = re.compile(r'(\.(?:jpe?g|png|gif))(?:_[^/]*|\.webp)$', re.IGNORECASE)
+
+
+def canonical_alicdn_url(url):
+    """Full-size https URL of an alicdn image
+
+    Drops the resize and recompression variants the CDN serves for the same
+    object: "x.220x220.jpg", "x.summ.jpg", "x.search.jpg", "x.jpg_430x430q90.jpg",
+    "x.jpg_.webp". Scheme-relative and scheme-less URLs are forced to https.
+    """
+    url = _ALICDN_SCHEME_RE.sub('https://', url.strip(), 1)
+    return _ALICDN_DERIVED_RE.sub(r'\1', _ALICDN_RESIZE_RE.sub('.', url))
+
+
+_ALICDN_OBJECT_RE = re.compile(r'O1CN[0-9A-Za-z]{8,}')
+
+
+def alicdn_image_key(url):
+    """Identity of an alicdn image regardless of host and size variant"""
+    mobj = _ALICDN_OBJECT_RE.search(url)
+    if mobj:
+        return mobj.group(0)
+    return urllib.parse.urlparse(canonical_alicdn_url(url)).path
+
+
+def unique_thumbnails(*sources):
+    """Merge (source name, image urls) groups into one thumbnail list
+
+    Images are keyed by their CDN object ID, so a picture seen again on
+    another host or in another size keeps its first position; the 'sources'
+    of each thumbnail name every group it was found in.
+    """
+    thumbnails = {}
+    for source, urls in sources:
+        for url in urls:
+            thumb = thumbnails.setdefault(alicdn_image_key(url), {
+                'url': canonical_alicdn_url(url),
+                'sources': [],
+            })
+            if source not in thumb['sources']:
+                thumb['sources'].append(source)
+    return list(thumbnails.values())
+
+
+# Rendering modifiers between the image ID and the extension: "ID._AC_SL1500_.jpg"
+_AMAZON_MODIFIERS_RE = re.compile(r'\._[^/]*_(?=\.\w+$)')
+
+
+def amazon_image_key(url):
+    """Identity of an Amazon media image regardless of host and rendering"""
+    return _AMAZON_MODIFIERS_RE.sub('', urllib.parse.urlparse(url).path)
+
+
+def item_host(url):
+    """Host of url without "www.", naming the site an item id belongs to"""
+    host = urllib.parse.urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+PLUGIN_ARGS_KEY = 'yt_dlp_taobao'
+
+
+def plugin_arg(ie, key, default=None, casesense=False):
+    """First value of an extractor argument given to the extractor itself or,
+    failing that, to all plugin extractors (--extractor-args "yt_dlp_taobao:KEY=VALUE")"""
+    for ie_key in (None, PLUGIN_ARGS_KEY):
+        value = ie._configuration_arg(key, None, ie_key=ie_key, casesense=casesense)
+        if value is not None:
+            return value[0]
+    return default
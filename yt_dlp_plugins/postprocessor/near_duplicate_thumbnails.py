@@ -0,0 +1,122 @@
+# coding: utf-8
+import hashlib
+import os
+
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp.utils import PostProcessingError, int_or_none
+
+_HASH_SIZE, _SAMPLE_SIZE = 8, 32
+
+# numpy and Pillow are imported on first use, keeping them out of yt-dlp startup
+
+
+def _dct_matrix(n):
+    """Orthonormal DCT-II matrix"""
+    import numpy
+    k, i = numpy.ogrid[:n, :n]
+    matrix = numpy.sqrt(2 / n) * numpy.cos(numpy.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= numpy.sqrt(2)
+    return matrix
+
+
+def perceptual_hashes(samples):
+    """64-bit DCT hashes (N x 8 uint8) of a stack of N grayscale 32x32 samples"""
+    import numpy
+    dct = _dct_matrix(_SAMPLE_SIZE)
+    low = (dct @ samples @ dct.T)[:, :_HASH_SIZE, :_HASH_SIZE].reshape(len(samples), -1)
+    return numpy.packbits(low > numpy.median(low, axis=1, keepdims=True), axis=1)
+
+
+def hamming_distances(hashes):
+    """Pairwise Hamming distances (N x N) of packed hashes"""
+    import numpy
+    return numpy.unpackbits(hashes[:, None, :] ^ hashes[None, :, :], axis=2).sum(axis=2)
+
+
+class NearDuplicateThumbnailsPP(PostProcessor):
+    """Collapse visually identical thumbnails, keeping the largest of each group
+
+        --write-all-thumbnails --use-postprocessor "NearDuplicateThumbnails:when=before_dl;threshold=6"
+
+    Works on thumbnails already on disk. yt-dlp writes them after the "video"
+    stage, so with --write-all-thumbnails this must run at before_dl or later;
+    after ParallelThumbnails, which writes them itself, "video" also works.
+    Thumbnails not on disk are left alone, with a warning. All images of a video are hashed in one batch
+    with a DCT perceptual hash; images within threshold bits of a larger one
+    are dropped and their files deleted. Hashes are cached by content hash
+    in the yt-dlp cache dir.
+    Requires numpy and Pillow.
+    """
+    _CACHE_SECTION = 'yt-dlp-taobao-phash'
+
+    def __init__(self, downloader=None, threshold=6):
+        super().__init__(downloader)
+        self._threshold = int_or_none(threshold) or 0
+        self._hashes = {}
+
+    def _content_hash(self, thumbnail):
+        if thumbnail.get('sha1'):
+            return thumbnail['sha1']
+        with open(thumbnail['filepath'], 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def _load_hashes(self, thumbnails):
+        """Return [(hash bytes, width * height)] of the thumbnails, decoding only uncached ones"""
+        import numpy
+        from PIL import Image
+
+        digests = [self._content_hash(t) for t in thumbnails]
+        missing = []
+        for t, digest in zip(thumbnails, digests):
+            if digest not in self._hashes:
+                cached = self._downloader.cache.load(self._CACHE_SECTION, digest)
+                if cached:
+                    self._hashes[digest] = bytes.fromhex(cached['hash']), cached['area']
+                else:
+                    missing.append((t, digest))
+
+        if missing:
+            samples, areas = [], []
+            for t, _ in missing:
+                with Image.open(t['filepath']) as img:
+                    areas.append(img.width * img.height)
+                    samples.append(numpy.asarray(
+                        img.convert('L').resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.LANCZOS), dtype=numpy.float64))
+            for (_, digest), phash, area in zip(missing, perceptual_hashes(numpy.stack(samples)), areas):
+                self._hashes[digest] = phash.tobytes(), area
+                self._downloader.cache.store(self._CACHE_SECTION, digest, {'hash': phash.tobytes().hex(), 'area': area})
+        return [self._hashes[digest] for digest in digests]
+
+    def run(self, info):
+        thumbnails = [t for t in info.get('thumbnails') or [] if t.get('filepath') and os.path.exists(t['filepath'])]
+        missing = len(info.get('thumbnails') or []) - len(thumbnails)
+        if missing:
+            self.report_warning(
+                f'{missing} thumbnails are not on disk and are left alone; with --write-all-thumbnails, '
+                'run this at when=before_dl')
+        if len(thumbnails) < 2:
+            return [], info
+        try:
+            import numpy
+            hashes = self._load_hashes(thumbnails)
+        except ImportError:
+            raise PostProcessingError('NearDuplicateThumbnails requires numpy and Pillow')
+        except OSError as err:
+            raise PostProcessingError(f'Unable to read thumbnails: {err}')
+        distances = hamming_distances(
+            numpy.frombuffer(b''.join(h for h, _ in hashes), numpy.uint8).reshape(len(hashes), -1))
+
+        # Largest resolution first; the larger file is the better encode of the same size
+        order = sorted(range(len(thumbnails)), reverse=True, key=lambda i: (
+            hashes[i][1], os.path.getsize(thumbnails[i]['filepath'])))
+        kept = []
+        for idx in order:
+            if all(distances[idx, other] > self._threshold for other in kept):
+                kept.append(idx)
+        kept = set(kept)
+        dropped = [t for idx, t in enumerate(thumbnails) if idx not in kept]
+        if dropped:
+            self.to_screen(f'Dropping {len(dropped)} near-duplicate thumbnails of {len(thumbnails)}')
+        dropped_ids = {id(t) for t in dropped}
+        info['thumbnails'] = [t for t in info['thumbnails'] if id(t) not in dropped_ids]
+        return [t['filepath'] for t in dropped], info
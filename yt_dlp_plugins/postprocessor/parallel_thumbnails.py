@@ -0,0 +1,125 @@
+# coding: utf-8
+import collections
+import concurrent.futures
+import hashlib
+import os
+import threading
+import time
+import urllib.parse
+
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError, network_exceptions
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp.utils import (
+    determine_ext,
+    int_or_none,
+    replace_extension,
+)
+
+
+class ParallelThumbnailsPP(PostProcessor):
+    """Download every thumbnail of a video concurrently
+
+        --use-postprocessor "ParallelThumbnails:when=video;workers=8;per_host=4"
+
+    Thumbnails are fetched by a bounded pool with at most per_host connections
+    per host, retried with exponential backoff and written to the paths
+    --write-all-thumbnails would use. Files already on disk are not downloaded
+    again. Byte-identical images are written once; their duplicates are
+    dropped from the thumbnail list.
+
+    Files on disk are only looked up under their indexed name ("v.0.jpg"):
+    a "v.jpg", say from an earlier --write-thumbnail, does not tell which
+    thumbnail it is. When a single thumbnail is left after deduplication it
+    is moved, or written over any such file, to "v.jpg".
+
+    Combined with --write-all-thumbnails this needs --no-overwrites, or
+    yt-dlp would download every thumbnail again after this has run.
+    """
+
+    def __init__(self, downloader=None, workers=8, per_host=4, retries=3, backoff=0.5):
+        super().__init__(downloader)
+        self._workers = int_or_none(workers) or 8
+        self._retries = int_or_none(retries) or 0
+        self._backoff = float(backoff)
+        per_host = int_or_none(per_host) or 4
+        self._host_slots = collections.defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._lock = threading.Lock()
+
+    def _thumbnail_path(self, info, thumbnail, multiple):
+        """Final path of a thumbnail, as chosen by YoutubeDL._write_thumbnails"""
+        ext = thumbnail.get('ext') or determine_ext(thumbnail['url'], 'jpg')
+        if multiple:
+            ext = f'{thumbnail["id"]}.{ext}'
+        return replace_extension(self._downloader.prepare_filename(info, 'thumbnail'), ext, info.get('ext'))
+
+    def _fetch(self, thumbnail):
+        with self._lock:
+            slot = self._host_slots[urllib.parse.urlparse(thumbnail['url']).netloc]
+        for attempt in range(self._retries + 1):
+            try:
+                with slot:
+                    return self._downloader.urlopen(
+                        Request(thumbnail['url'], headers=thumbnail.get('http_headers', {}))).read()
+            except network_exceptions as err:
+                if (isinstance(err, HTTPError) and err.status == 404) or attempt == self._retries:
+                    raise
+                time.sleep(self._backoff * 2 ** attempt)
+
+    def _load(self, thumbnail, path):
+        """Return (contents, path if read from disk or None if downloaded)"""
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read(), path
+        return self._fetch(thumbnail), None
+
+    def run(self, info):
+        thumbnails = info.get('thumbnails') or []
+        if self.get_param('simulate') or len(thumbnails) < 2:
+            return [], info
+        if self.get_param('write_all_thumbnails') and self.get_param('overwrites') is not False:
+            self.to_screen('yt-dlp would overwrite the thumbnails; leaving them to it (see --no-overwrites)')
+            return [], info
+
+        paths = {t['id']: self._thumbnail_path(info, t, True) for t in thumbnails}
+        os.makedirs(os.path.dirname(os.path.abspath(paths[thumbnails[0]['id']])), exist_ok=True)
+        self.to_screen(f'Downloading {len(thumbnails)} thumbnails with {self._workers} workers')
+        with concurrent.futures.ThreadPoolExecutor(self._workers) as pool:
+            futures = {t['id']: pool.submit(self._load, t, paths[t['id']]) for t in thumbnails}
+
+        seen, kept, contents = set(), [], {}
+        for t in thumbnails:
+            try:
+                data, source = futures[t['id']].result()
+            except network_exceptions as err:
+                if isinstance(err, HTTPError) and err.status == 404:
+                    self.to_screen(f'Thumbnail {t["id"]} does not exist')
+                    continue
+                # Keep it, yt-dlp will try once more
+                self.report_warning(f'Unable to download thumbnail {t["id"]}: {err}')
+                kept.append(t)
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+            if digest in seen:
+                self.write_debug(f'Thumbnail {t["id"]} is identical to an earlier one; skipping')
+                continue
+            seen.add(digest)
+            t['sha1'] = digest
+            kept.append(t)
+            contents[t['id']] = data, source
+
+        multiple = len(kept) > 1
+        for t in kept:
+            if t['id'] not in contents:
+                continue
+            data, source = contents[t['id']]
+            t['filepath'] = path = self._thumbnail_path(info, t, multiple)
+            if source is None:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            elif source != path:
+                os.replace(source, path)
+        self.to_screen(
+            f'{len(contents)} unique thumbnails on disk, {len(thumbnails) - len(kept)} dropped')
+        info['thumbnails'] = kept
+        return [], info
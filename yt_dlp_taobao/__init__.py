@@ -0,0 +1,2 @@
+# coding: utf-8
+"""Runtime tools for driving the yt-dlp-taobao extractors at scale"""
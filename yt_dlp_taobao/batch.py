@@ -0,0 +1,139 @@
+# coding: utf-8
+"""Batch extraction of product URLs with one shared YoutubeDL
+
+    python -m yt_dlp_taobao.batch [-j WORKERS] [--per-host N] [--cookies FILE] [URLFILE]
+
+URLs are read one per line from URLFILE (default: stdin). One JSON line is
+written to stdout per URL as soon as its extraction finishes; throughput and
+latency figures are printed to stderr at the end.
+"""
+import argparse
+import collections
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.parse
+
+import yt_dlp
+
+from .singleflight import SingleFlight, flight_key
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, -(-len(values) * pct // 100) - 1)]
+
+
+class BatchRunner:
+    """Run extractions on a bounded pool of threads sharing one YoutubeDL
+
+    Concurrency towards a single host is capped at per_host, so that a burst
+    of links to the same site does not trip its throttling. Requests for an
+    item whose extraction is already running wait for it and share its
+    result instead of extracting it again.
+    """
+
+    def __init__(self, ydl, workers=8, per_host=2):
+        self.ydl = ydl
+        self.workers = workers
+        self._host_slots = collections.defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._lock = threading.Lock()
+        self.count = 0
+        self.coalesced = 0
+        self.latencies = []
+        self._flights = SingleFlight()
+
+    def _host_slot(self, url):
+        with self._lock:
+            return self._host_slots[urllib.parse.urlparse(url).netloc]
+
+    def _extract_info(self, url):
+        return self.ydl.sanitize_info(self.ydl.extract_info(url, download=False))
+
+    def _extract_in_slot(self, url):
+        with self._host_slot(url):
+            return self._extract_info(url)
+
+    def extract(self, url):
+        start = time.perf_counter()
+        shared = False
+        try:
+            info, shared = self._flights.do(flight_key(self.ydl, url), self._extract_in_slot, url)
+            result = {'url': url, 'info': info}
+        except Exception as e:  # one bad link must not take its worker down
+            result = {'url': url, 'error': str(e)}
+        latency = time.perf_counter() - start
+        with self._lock:
+            self.count += 1
+            self.coalesced += shared
+            self.latencies.append(latency)
+        result['elapsed'] = round(latency, 3)
+        return result
+
+    def run(self, urls, out=sys.stdout):
+        """Extract every URL of the iterable, writing JSON lines to out as they finish"""
+        pending = queue.Queue(self.workers * 2)
+
+        def worker():
+            while True:
+                url = pending.get()
+                if url is None:
+                    return
+                line = json.dumps(self.extract(url), ensure_ascii=False)
+                with self._lock:
+                    out.write(line + '\n')
+                    out.flush()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        for url in urls:
+            url = url.strip()
+            if url and not url.startswith('#'):
+                pending.put(url)
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+        return self.stats(time.perf_counter() - start)
+
+    def stats(self, elapsed):
+        return {
+            'count': self.count,
+            'coalesced': self.coalesced,
+            'elapsed': round(elapsed, 3),
+            'throughput': round(self.count / elapsed, 3) if elapsed else None,
+            'p50': percentile(self.latencies, 50),
+            'p95': percentile(self.latencies, 95),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yt_dlp_taobao.batch', description=__doc__.splitlines()[0])
+    parser.add_argument('urlfile', nargs='?', type=argparse.FileType('r', encoding='utf-8'), default=sys.stdin)
+    parser.add_argument('-j', '--workers', type=int, default=8, help='number of extraction threads (default: %(default)s)')
+    parser.add_argument('--per-host', type=int, default=2, help='concurrent extractions per host (default: %(default)s)')
+    parser.add_argument('--cookies', metavar='FILE', help='Netscape cookie file shared by all extractions')
+    args = parser.parse_args(argv)
+
+    params = {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+        'cookiefile': args.cookies,
+    }
+    with yt_dlp.YoutubeDL(params) as ydl:
+        stats = BatchRunner(ydl, args.workers, args.per_host).run(args.urlfile)
+    print(
+        f'{stats["count"]} URLs in {stats["elapsed"]}s: {stats["throughput"]} URLs/s, '
+        f'p50 {stats["p50"] or 0:.3f}s, p95 {stats["p95"] or 0:.3f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# coding: utf-8
+"""Offline benchmark of the plugin extractors against recorded pages
+
+    python -m yt_dlp_taobao.bench record FIXTURES NAME URL [--ie IE_KEY] [--cookies FILE]
+    python -m yt_dlp_taobao.bench run FIXTURES [--repeat N] [--tolerance T] [--save-baseline]
+
+"record" extracts URL live and stores every response it needed under
+FIXTURES as case NAME. "run" replays each case through a local stand-in HTTP
+server, reports wall time, CPU time and peak Python memory per case, and
+exits with status 1 if any of them regressed beyond the tolerance relative
+to FIXTURES/baseline.json.
+
+test/bench holds a synthetic case for each plugin extractor; test/test_bench.py
+replays them.
+"""
+import argparse
+import hashlib
+import http.server
+import io
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import yt_dlp
+from yt_dlp.networking import Request, Response
+
+METRICS = ('wall', 'cpu', 'peak')
+
+
+def _response_key(req):
+    return hashlib.sha1(req.url.encode() + b'\0' + (req.data or b'')).hexdigest()
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class _FixtureYoutubeDL(yt_dlp.YoutubeDL):
+    """YoutubeDL whose requests are recorded to, or replayed from, a fixture directory"""
+
+    def __init__(self, fixtures, server=None, params=None):
+        params = {
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'cachedir': False,
+            **(params or {}),
+        }
+        if server:
+            # Replays are local: pacing them would only measure the rate limiter's sleeps
+            extractor_args = params['extractor_args'] = dict(params.get('extractor_args') or {})
+            extractor_args['yt_dlp_taobao'] = {'rate_limit': ['0'], **extractor_args.get('yt_dlp_taobao', {})}
+        super().__init__(params)
+        self._responses = os.path.join(fixtures, 'responses')
+        self._server = server
+        os.makedirs(self._responses, exist_ok=True)
+
+    def urlopen(self, req):
+        if isinstance(req, str):
+            req = Request(req)
+        key = _response_key(req)
+        meta_path = os.path.join(self._responses, f'{key}.json')
+        if self._server:
+            meta = _load_json(meta_path, None)
+            if meta is None:
+                raise yt_dlp.utils.ExtractorError(f'No recorded response for {req.url}')
+            local = req.copy()
+            local.url = f'{self._server}/{key}'
+            local.proxies = {'all': None}
+            res = super().urlopen(local)
+            return Response(res, meta['final_url'], res.headers, res.status)
+
+        res = super().urlopen(req)
+        data = res.read()
+        with open(os.path.join(self._responses, f'{key}.body'), 'wb') as f:
+            f.write(data)
+        _save_json(meta_path, {
+            'url': req.url,
+            'final_url': res.url,
+            'status': res.status,
+            'content_type': res.headers.get('Content-Type'),
+        })
+        return Response(io.BytesIO(data), res.url, res.headers, res.status)
+
+
+def _serve(fixtures, port_queue):
+    responses = os.path.join(fixtures, 'responses')
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _reply(self):
+            key = os.path.basename(self.path)
+            meta = _load_json(os.path.join(responses, f'{key}.json'), None)
+            if meta is None:
+                self.send_error(404)
+                return
+            with open(os.path.join(responses, f'{key}.body'), 'rb') as f:
+                data = f.read()
+            self.send_response(meta['status'])
+            self.send_header('Content-Type', meta['content_type'] or 'application/octet-stream')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_HEAD = _reply
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def record(fixtures, name, url, ie_key=None, cookies=None):
+    with _FixtureYoutubeDL(fixtures, params={'cookiefile': cookies}) as ydl:
+        ydl.extract_info(url, download=False, process=False, ie_key=ie_key)
+    cases_path = os.path.join(fixtures, 'cases.json')
+    cases = [case for case in _load_json(cases_path, []) if case['name'] != name]
+    cases.append({'name': name, 'url': url, 'ie': ie_key})
+    _save_json(cases_path, cases)
+
+
+def measure(ydl, case, repeat):
+    def extract():
+        ydl.extract_info(case['url'], download=False, process=False, ie_key=case.get('ie'))
+
+    extract()  # warm up imports and regex caches
+    walls, cpus = [], []
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        extract()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    tracemalloc.start()
+    try:
+        extract()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'wall': statistics.median(walls), 'cpu': statistics.median(cpus), 'peak': peak}
+
+
+def run(fixtures, repeat=5, tolerance=0.25, save_baseline=False, out=sys.stdout):
+    """Benchmark every recorded case; return the names of the regressed ones"""
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(fixtures, port_queue), daemon=True)
+    server.start()
+    try:
+        results = {}
+        with _FixtureYoutubeDL(fixtures, server=f'http://127.0.0.1:{port_queue.get()}') as ydl:
+            for case in _load_json(os.path.join(fixtures, 'cases.json'), []):
+                results[case['name']] = measure(ydl, case, repeat)
+    finally:
+        server.terminate()
+
+    baseline_path = os.path.join(fixtures, 'baseline.json')
+    baseline = _load_json(baseline_path, {})
+    regressions = []
+    out.write(f'{"case":<24}{"wall ms":>10}{"cpu ms":>10}{"peak KiB":>10}\n')
+    for name, result in results.items():
+        worse = [
+            metric for metric in METRICS
+            if name in baseline and result[metric] > baseline[name][metric] * (1 + tolerance)]
+        if worse:
+            regressions.append(name)
+        out.write(
+            f'{name:<24}{result["wall"] * 1000:>10.1f}{result["cpu"] * 1000:>10.1f}'
+            f'{result["peak"] / 1024:>10.0f}{"  REGRESSED: " + ", ".join(worse) if worse else ""}\n')
+    if save_baseline:
+        _save_json(baseline_path, results)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yt_dlp_taobao.bench', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help='record the responses of a live extraction as a case')
+    rec.add_argument('fixtures')
+    rec.add_argument('name')
+    rec.add_argument('url')
+    rec.add_argument('--ie', help='extractor key to use (default: first one matching the URL)')
+    rec.add_argument('--cookies', metavar='FILE', help='Netscape cookie file for the live extraction')
+    bench = commands.add_parser('run', help='benchmark every recorded case')
+    bench.add_argument('fixtures')
+    bench.add_argument('--repeat', type=int, default=5, help='timed runs per case (default: %(default)s)')
+    bench.add_argument('--tolerance', type=float, default=0.25,
+                       help='allowed slowdown relative to the baseline (default: %(default)s)')
+    bench.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        record(args.fixtures, args.name, args.url, args.ie, args.cookies)
+        return
+    regressions = run(args.fixtures, args.repeat, args.tolerance, args.save_baseline)
+    if regressions:
+        sys.exit(f'Regressed: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
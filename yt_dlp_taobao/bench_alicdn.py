@@ -0,0 +1,89 @@
+# coding: utf-8
+"""Micro-benchmark of alicdn thumbnail URL canonicalization
+
+    python -m yt_dlp_taobao.bench_alicdn [--urls N] [--repeat N]
+
+Compares canonical_alicdn_url applied per URL with the approach it replaced
+in Ali1688IE: repr() of the whole thumbnail list, one re.sub over that
+string and ast.literal_eval to turn it back into a list. Reports the mean
+time and the tracemalloc peak of each over the same mixed set of cbu01/img
+URLs in all the size and recompression variants the CDN serves.
+"""
+import argparse
+import ast
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from yt_dlp_plugins.extractor._utils import canonical_alicdn_url
+
+_VARIANTS = (
+    '{}.jpg', '{}.220x220.jpg', '{}.summ.jpg', '{}.search.jpg',
+    '{}.jpg_430x430q90.jpg', '{}.jpg_.webp', '{}.310x310.jpg_.webp')
+_OLD_RESIZE_RE = re.compile(r'(\.(?:[-_]?\d{2,4}x\d{2,4})+\.)|(.summ.)|(.search.)')
+
+
+def sample_urls(count, seed=0):
+    """count alicdn image URLs, mixing hosts, schemes and size variants"""
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(count):
+        host = rng.choice(('cbu01.alicdn.com/img/ibank', 'img.alicdn.com/imgextra/i4'))
+        path = f'{host}/O1CN01{"".join(rng.choices("abcdefghijkLMNOPQ0123456789", k=16))}_!!2200{rng.randrange(10 ** 6)}'
+        scheme = rng.choice(('https://', '//', ''))
+        urls.append(scheme + rng.choice(_VARIANTS).format(path))
+    return urls
+
+
+def literal_eval_thumbnails(urls):
+    thumb = [{'url': url} for url in urls]
+    return ast.literal_eval(_OLD_RESIZE_RE.sub('.', str(thumb)))
+
+
+def canonical_thumbnails(urls):
+    return [{'url': canonical_alicdn_url(url)} for url in urls]
+
+
+APPROACHES = {
+    'repr + re.sub + literal_eval': literal_eval_thumbnails,
+    'canonical_alicdn_url per URL': canonical_thumbnails,
+}
+
+
+def measure(func, urls, repeat):
+    """Return (mean seconds, peak bytes) of func(urls)"""
+    func(urls)  # compile the regexes
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(urls)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    try:
+        func(urls)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(count=600, repeat=200, out=sys.stdout):
+    urls = sample_urls(count)
+    results = {name: measure(func, urls, repeat) for name, func in APPROACHES.items()}
+    out.write(f'{count} URLs, mean of {repeat} runs\n')
+    for name, (elapsed, peak) in results.items():
+        out.write(f'  {name:<32}{elapsed * 1000:>8.2f} ms, peak {peak / 1024:>6.0f} KiB\n')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yt_dlp_taobao.bench_alicdn', description=__doc__.splitlines()[0])
+    parser.add_argument('--urls', type=int, default=600, help='thumbnail URLs per run (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=200, help='timed runs (default: %(default)s)')
+    args = parser.parse_args(argv)
+    run(args.urls, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# coding: utf-8
+"""Resident extraction server keeping one warm YoutubeDL
+
+    python -m yt_dlp_taobao.daemon [--bind HOST:PORT | --socket PATH] [-j WORKERS] [--per-host N] [--cookies FILE]
+
+Endpoints, all answering JSON:
+
+    GET  /extract?url=URL       extract URL (or POST /extract with {"url": URL})
+    GET  /stats                 requests, throughput and latency since start,
+                                and the current request rate of every host
+    POST /reload-cookies        reload the cookie file now (also on SIGHUP)
+    POST /invalidate            forget what the product cache holds about the
+                                item of {"url": URL}, e.g. once it is re-listed
+
+Plugins, cookies and the connection pools of yt-dlp's request handlers stay
+loaded between requests. A login redirect reloads the cookie file, if it has
+changed since it was last read, and retries the extraction once. SIGTERM and
+SIGINT stop accepting requests and let the running ones finish.
+"""
+import argparse
+import http.server
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+import urllib.parse
+
+import yt_dlp
+from yt_dlp.cookies import YoutubeDLCookieJar
+
+from yt_dlp_plugins.extractor._common import LoginRedirectError
+from yt_dlp_plugins.extractor._ratelimit import HostRateLimiter
+
+from .batch import BatchRunner
+from .singleflight import flight_key
+
+
+class DaemonRunner(BatchRunner):
+    """BatchRunner serving single requests, with at most `workers` extractions at a time"""
+
+    def __init__(self, ydl, workers=8, per_host=2):
+        super().__init__(ydl, workers, per_host)
+        self.started = time.time()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._cookies_lock = threading.Lock()
+        self._cookies_mtime = self._cookiefile_mtime()
+
+    def _cookiefile_mtime(self):
+        path = self.ydl.params.get('cookiefile')
+        try:
+            return path and os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def reload_cookies(self, force=True):
+        """Reload the cookie file; unless forced, only if it changed since it was read"""
+        if not self.ydl.params.get('cookiefile'):
+            return False
+        with self._cookies_lock:
+            mtime = self._cookiefile_mtime()
+            if not force and mtime == self._cookies_mtime:
+                return False
+            jar = self.ydl.cookiejar
+            fresh = YoutubeDLCookieJar(jar.filename)
+            fresh.load()
+            # Swap the contents in at once: requests in flight never see an empty jar
+            with jar._cookies_lock:
+                jar._cookies = fresh._cookies
+            self._cookies_mtime = mtime
+        self.ydl.to_stderr(f'Reloaded cookies from {self.ydl.params["cookiefile"]}')
+        return True
+
+    def invalidate(self, url):
+        """Drop the cached and negative cache entries of the item of url; return whether there were any"""
+        ie_key, _, item_id = flight_key(self.ydl, url)
+        ie = ie_key and self.ydl.get_info_extractor(ie_key)
+        store = ie._product_store() if hasattr(ie, '_product_store') else None
+        return bool(store and store.invalidate(ie._item_site(url), item_id))
+
+    def _extract_info(self, url):
+        try:
+            return super()._extract_info(url)
+        except yt_dlp.utils.DownloadError as e:
+            if not isinstance((e.exc_info or (None, None))[1], LoginRedirectError) or not self.reload_cookies(False):
+                raise
+        return super()._extract_info(url)
+
+    def _extract_in_slot(self, url):
+        with self._slots:
+            return super()._extract_in_slot(url)
+
+    def stats(self, elapsed=None):
+        return {
+            **super().stats(time.time() - self.started if elapsed is None else elapsed),
+            'rate_limits': HostRateLimiter.shared().stats(),
+        }
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    runner = None
+
+    def _reply(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _extract(self, url):
+        if not url:
+            return self._reply(400, {'error': 'No URL given'})
+        result = self.runner.extract(url)
+        self._reply(422 if 'error' in result else 200, result)
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path == '/extract':
+            return self._extract(urllib.parse.parse_qs(query).get('url', [None])[0])
+        if path == '/stats':
+            return self._reply(200, self.runner.stats())
+        self._reply(404, {'error': f'Unknown path {path}'})
+
+    def do_POST(self):
+        try:
+            data = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        except ValueError:
+            return self._reply(400, {'error': 'Request body is not JSON'})
+        if self.path == '/extract':
+            return self._extract(data.get('url'))
+        if self.path == '/reload-cookies':
+            return self._reply(200, {'reloaded': self.runner.reload_cookies()})
+        if self.path == '/invalidate':
+            if not data.get('url'):
+                return self._reply(400, {'error': 'No URL given'})
+            return self._reply(200, {'invalidated': self.runner.invalidate(data['url'])})
+        self._reply(404, {'error': f'Unknown path {self.path}'})
+
+    def address_string(self):
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = False  # server_close() waits for the running requests
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = False
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def serve(runner, bind=None, socket_path=None):
+    handler = type('Handler', (_Handler, ), {'runner': runner})
+    if socket_path:
+        server = _UnixHTTPServer(socket_path, handler)
+    else:
+        host, _, port = (bind or '127.0.0.1:8723').rpartition(':')
+        server = _HTTPServer((host or '127.0.0.1', int(port)), handler)
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: runner.reload_cookies())
+    runner.ydl.to_stderr(f'Serving on {socket_path or "http://%s:%d" % server.server_address}')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if socket_path:
+            os.unlink(socket_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yt_dlp_taobao.daemon', description=__doc__.splitlines()[0])
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument('--bind', metavar='HOST:PORT', help='TCP address to listen on (default: 127.0.0.1:8723)')
+    where.add_argument('--socket', metavar='PATH', help='Unix socket to listen on instead')
+    parser.add_argument('-j', '--workers', type=int, default=8, help='concurrent extractions (default: %(default)s)')
+    parser.add_argument('--per-host', type=int, default=2, help='concurrent extractions per host (default: %(default)s)')
+    parser.add_argument('--cookies', metavar='FILE', help='Netscape cookie file shared by all extractions')
+    args = parser.parse_args(argv)
+
+    params = {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+        'cookiefile': args.cookies,
+    }
+    with yt_dlp.YoutubeDL(params) as ydl:
+        serve(DaemonRunner(ydl, args.workers, args.per_host), args.bind, args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# coding: utf-8
+"""Coalescing of concurrent extractions of the same item"""
+import threading
+
+from yt_dlp_plugins.extractor._utils import item_host
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run a function once per key among the callers that overlap in time
+
+    A caller arriving while the key is in flight waits for that call and gets
+    its result, or its exception raised again; once the call has finished
+    the next caller starts a new one. Nothing is cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, *args, **kwargs):
+        """Return (result of func, whether it was shared with an earlier caller)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def flight_key(ydl, url):
+    """(extractor, host, item id) of url, as yt-dlp would pick the extractor; url itself if unknown
+
+    The host is None unless the extractor's item ids are only unique per host
+    (_ITEM_IDS_PER_HOST): an ASIN names a different listing on every Amazon
+    marketplace.
+    """
+    for ie_key, ie in ydl._ies.items():
+        if ie_key != 'Generic' and ie.suitable(url):
+            per_host = getattr(ydl.get_info_extractor(ie_key), '_ITEM_IDS_PER_HOST', False)
+            host = item_host(url) if per_host else None
+            return ie_key, host, ie.get_temp_id(url) or url
+    return None, None, url